@@ -1,12 +1,24 @@
 from .builder import Builder
-from .colors import ColorPalette
-from .mode import Mode, DEBUG, AUTO
+from .async_builder import AsyncBuilder
+from .batch import BatchResult, run_batch
+from .cache import MutationCache
+from .compare import BuilderDiff, diff
+from .colors import ColorPalette, PaletteMode
+from .mode import Mode, ModeType, DEBUG, AUTO
 
 
 __all__ = [
     "Builder",
+    "AsyncBuilder",
+    "BatchResult",
+    "run_batch",
+    "MutationCache",
+    "BuilderDiff",
+    "diff",
     "ColorPalette",
+    "PaletteMode",
     "Mode",
+    "ModeType",
     "DEBUG",
     "AUTO",
 ]
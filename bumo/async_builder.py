@@ -0,0 +1,152 @@
+"""Module containing the AsyncBuilder class."""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable
+
+import build123d as _
+
+from .builder import Builder, PartsLike
+from .mutation import Mutation
+from .mode import Mode, AUTO
+from .colors import ColorLike
+
+
+class AsyncBuilder:
+    """An asyncio facade of a builder, running its mutations in an executor so
+    they don't block the event loop. The mutations of a builder are applied
+    one after the other, in the order they were awaited, while several
+    builders can mutate concurrently. A cancelled mutation is undone as soon
+    as it is computed. The executor must run in the process of the builder,
+    so only thread pools are accepted."""
+
+    def __init__(
+            self,
+            builder: Builder | None = None,
+            executor: ThreadPoolExecutor | None = None,
+        ):
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError(
+                "The executor must be a ThreadPoolExecutor: other executors would "
+                "mutate a copy of the builder."
+            )
+
+        self.builder = Builder() if builder is None else builder
+        self.executor = executor
+        self._lock = asyncio.Lock()
+
+    async def _run(self, method: str, *args, **kwargs):
+        """Run the given builder method in the executor, once the previous
+        mutations of this builder are done."""
+
+        async with self._lock:
+            mutations_amount = len(self.builder.mutations)
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                partial(getattr(self.builder, method), *args, **kwargs)
+            )
+
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                await asyncio.wait([future])
+                while len(self.builder.mutations) > mutations_amount:
+                    self.builder.undo()
+                raise
+
+    async def add(
+            self,
+            part: PartsLike,
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: fuse the given part (or list of parts) to the current
+        object, with the given color and debug mode."""
+
+        if isinstance(part, list):
+            return await self._run('add_many', part, mode, **options)
+        return await self._run('add', part, mode, **options)
+
+    async def sub(
+            self,
+            part: PartsLike,
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: substract the given part (or list of parts) from the
+        current object, with the given color and debug mode."""
+
+        if isinstance(part, list):
+            return await self._run('sub_many', part, mode, **options)
+        return await self._run('sub', part, mode, **options)
+
+    async def intersect(
+            self,
+            part: Builder | _.Part,
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: intersect the given part to the current object,
+        with the given color and debug mode."""
+
+        return await self._run('intersect', part, mode, **options)
+
+    async def add_pattern(
+            self,
+            part: Builder | _.Part,
+            locations: Iterable[_.Location],
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: fuse the given part placed at all the given locations to
+        the current object, with the given color and debug mode."""
+
+        return await self._run('add_pattern', part, list(locations), mode, **options)
+
+    async def sub_pattern(
+            self,
+            part: Builder | _.Part,
+            locations: Iterable[_.Location],
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: substract the given part placed at all the given locations
+        from the current object, with the given color and debug mode."""
+
+        return await self._run('sub_pattern', part, list(locations), mode, **options)
+
+    async def move(self, location: _.Location, mode: Mode | ColorLike = AUTO) -> Mutation:
+        """Mutation: move the object to the given location, keeping the colors
+        unless a color or debug mode is given."""
+
+        return await self._run('move', location, mode)
+
+    async def fillet(
+            self,
+            edges: Iterable[_.Edge] | _.Edge,
+            radius: float,
+            mode: Mode | ColorLike = AUTO,
+        ) -> Mutation:
+        """Mutation: apply a fillet of the given radius to the given edges of
+        the current object, with the given color and debug mode."""
+
+        return await self._run('fillet', edges, radius, mode)
+
+    async def chamfer(
+            self,
+            edges: Iterable[_.Edge] | _.Edge,
+            length: float,
+            length2: float | None = None,
+            face: _.Face | None = None,
+            mode: Mode | ColorLike = AUTO,
+        ) -> Mutation:
+        """Mutation: apply a chamfer of the given length to the given edges of
+        the current object, with the given color and debug mode."""
+
+        return await self._run('chamfer', edges, length, length2, face, mode)
+
+    async def undo(self) -> Mutation:
+        """Undo the last mutation, once the previous mutations are done."""
+
+        return await self._run('undo')
@@ -0,0 +1,156 @@
+"""A module used to build many variants of a parametric part in a pool of
+processes."""
+from __future__ import annotations
+from concurrent.futures import (
+    Future, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+)
+from itertools import islice, product
+from os import cpu_count
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, TypeAlias
+
+import build123d as _
+
+from .builder import Builder
+from .mutation import Mutation
+from .shapes import shape_to_brep, brep_to_shape
+
+
+ParamsGrid: TypeAlias = (
+    dict[str, Iterable[Any]] | # values of each parameter, ex: {"width": [1, 2]}
+    Iterable[dict[str, Any]] # list of parameters sets, ex: [{"width": 1}]
+)
+
+
+class BatchResult:
+    """The result of a builder function called with a set of parameters: the
+    built object as a BREP blob, the mutations stats and the build time, or
+    the error raised by the function."""
+
+    def __init__(
+            self,
+            index: int,
+            params: dict[str, Any],
+            brep: bytes | None = None,
+            mutations: list[dict[str, Any]] | None = None,
+            duration: float = 0.0,
+            error: str | None = None,
+        ):
+        self.index = index
+        self.params = params
+        self.brep = brep
+        self.mutations = mutations or []
+        self.duration = duration
+        self.error = error
+
+    def get_object(self) -> _.Part:
+        """Return the built object, read from the BREP blob."""
+
+        if self.brep is None:
+            raise ValueError(f"Variant { self.index } failed: { self.error }")
+        return brep_to_shape(self.brep)
+
+    def __repr__(self):
+        status = self.error or f"{ len(self.mutations) } mutations"
+        return f"BatchResult({ self.index }, { self.params }, { status })"
+
+
+def get_mutation_stats(mutation: Mutation) -> dict[str, Any]:
+    """Return the stats of the given mutation, using the info table columns
+    names."""
+
+    return {
+        "idx": mutation.index,
+        "label": mutation.id,
+        "type": mutation.name,
+        "f+": len(mutation.faces_added),
+        "f~": len(mutation.faces_altered),
+        "f-": len(mutation.faces_removed),
+        "e+": len(mutation.edges_added),
+        "e~": len(mutation.edges_altered),
+        "e-": len(mutation.edges_removed),
+        "f<": mutation.faces_unified,
+        "e<": mutation.edges_unified,
+        "time": mutation.duration,
+    }
+
+
+def iter_params(params: ParamsGrid) -> Iterator[dict[str, Any]]:
+    """Iterate over the parameters sets of the given grid: all the
+    combinations of the values of a dict, or the sets of a list as is."""
+
+    if isinstance(params, dict):
+        for values in product(*params.values()):
+            yield dict(zip(params.keys(), values))
+    else:
+        yield from params
+
+
+def _build_variants(
+        build_func: Callable[..., Builder],
+        variants: list[tuple[int, dict[str, Any]]]
+    ) -> list[BatchResult]:
+    """Call the builder function with each of the given parameters sets, and
+    return the results. Used by the pool workers."""
+
+    results = []
+
+    for index, params in variants:
+        start = perf_counter()
+        try:
+            builder = build_func(**params)
+            results.append(BatchResult(
+                index,
+                params,
+                shape_to_brep(builder.object),
+                [get_mutation_stats(mutation) for mutation in builder.mutations],
+                perf_counter() - start,
+            ))
+        except Exception as error: # pylint: disable=broad-exception-caught
+            error_str = f"{ type(error).__name__ }: { error }"
+            results.append(BatchResult(index, params, None, None, perf_counter() - start, error_str))
+
+    return results
+
+
+def run_batch(
+        build_func: Callable[..., Builder],
+        params: ParamsGrid,
+        workers: int | None = None,
+        chunksize: int = 1,
+        max_pending: int | None = None,
+    ) -> Iterator[BatchResult]:
+    """Call the given builder function (which must be picklable, ie. defined
+    at the module level) with each parameters set of the given grid, in a pool
+    of processes with the given amount of workers (the amount of CPUs by
+    default), each task building `chunksize` variants.
+
+    Results are yielded as they finish, so they are not ordered (see their
+    index). To keep the memory bounded, parameters sets are read lazily and
+    at most `max_pending` tasks (twice the amount of workers by default) are
+    submitted at once. A variant raising an error doesn't stop the batch: its
+    result contains the error message instead of the object."""
+
+    if chunksize < 1:
+        raise ValueError("The chunk size must be at least 1.")
+
+    workers = workers or cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    variants = enumerate(iter_params(params))
+    pending: set[Future] = set()
+
+    with ProcessPoolExecutor(workers) as executor:
+        try:
+            while chunk := list(islice(variants, chunksize)):
+                pending.add(executor.submit(_build_variants, build_func, chunk))
+
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+
+            for future in as_completed(pending):
+                yield from future.result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,195 @@
+"""A module used to run boolean operations while keeping track of the faces
+coming from each tool."""
+from __future__ import annotations
+from enum import Enum
+
+import build123d as _
+from OCP.BRepAlgoAPI import (
+    BRepAlgoAPI_BooleanOperation, BRepAlgoAPI_Fuse, BRepAlgoAPI_Cut,
+    BRepAlgoAPI_Common
+)
+from OCP.TopAbs import TopAbs_ShapeEnum, TopAbs_FACE, TopAbs_EDGE
+from OCP.TopExp import TopExp
+from OCP.TopTools import TopTools_IndexedMapOfShape, TopTools_ListOfShape
+from OCP.TopoDS import TopoDS_Shape
+
+from . import config
+
+
+class BooleanType(Enum):
+    """The boolean operations types."""
+    FUSE = 1
+    CUT = 2
+    COMMON = 3
+
+
+class Unification:
+    """The changes made by the unification of the same-domain faces and edges
+    of a boolean result: for each merged face, the face of the object it comes
+    from, and the amount of faces and edges removed."""
+
+    def __init__(
+            self,
+            faces_alias: dict[_.Face, _.Face],
+            faces_removed: int,
+            edges_removed: int,
+        ):
+        self.faces_alias = faces_alias
+        self.faces_removed = faces_removed
+        self.edges_removed = edges_removed
+
+
+def _count_shapes(shape: TopoDS_Shape, shape_type: TopAbs_ShapeEnum) -> int:
+    """Return the amount of distinct sub-shapes of the given type."""
+
+    shapes_map = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(shape, shape_type, shapes_map)
+    return shapes_map.Extent()
+
+
+def _to_list(shapes: list[_.Shape]) -> TopTools_ListOfShape:
+    """Cast a list of build123d shapes to an OCCT list of shapes."""
+
+    shapes_list = TopTools_ListOfShape()
+    for shape in shapes:
+        shapes_list.Append(shape.wrapped)
+    return shapes_list
+
+
+def _get_operation(boolean_type: BooleanType) -> BRepAlgoAPI_BooleanOperation:
+    """Return a new OCCT operation corresponding to the given boolean type."""
+
+    if boolean_type == BooleanType.FUSE:
+        return BRepAlgoAPI_Fuse()
+    if boolean_type == BooleanType.CUT:
+        return BRepAlgoAPI_Cut()
+    return BRepAlgoAPI_Common()
+
+
+def _get_images(
+        operation: BRepAlgoAPI_BooleanOperation,
+        face: _.Face
+    ) -> list[_.Face]:
+    """Return the faces of the operation result coming from the given face."""
+
+    if operation.IsDeleted(face.wrapped):
+        return []
+
+    modified = operation.Modified(face.wrapped)
+    if modified.Size() == 0:
+        return [face]
+    return [_.Face(image) for image in modified]
+
+
+def boolean(
+        boolean_type: BooleanType,
+        obj: _.Part,
+        tools: list[_.Part],
+        clean: bool | None = None,
+        parallel: bool | None = None,
+        fuzzy: float | None = None,
+        obb: bool | None = None,
+    ) -> tuple[_.Part, dict[_.Face, int], Unification | None]:
+    """Apply the given boolean operation between the object and all the given
+    tools at once. Return the resulting object, a dict containing, for each
+    face of the result coming from a tool, the index of this tool, and the
+    changes made by the cleaning, if the result was cleaned.
+
+    The result is cleaned (ie. same-domain faces and edges are unified) if
+    `clean` is True, or for fuse and common operations if it is None, as with
+    the build123d operators. Unlike the other options, it doesn't default to
+    the configuration, since None is a valid value of BOOLEAN_CLEAN: builders
+    pass their own.
+    The `parallel`, `fuzzy` and `obb` options of the OCCT boolean algorithm
+    default to the BOOLEAN_PARALLEL, BOOLEAN_FUZZY and BOOLEAN_OBB options of
+    the current configuration.
+    """
+
+    if not tools:
+        raise ValueError("No tool given to the boolean operation.")
+
+    if obj.wrapped is None:
+        if boolean_type != BooleanType.FUSE:
+            raise ValueError("Cannot apply this operation on an empty object.")
+
+        if len(tools) == 1: # a new shape, so moving the tool doesn't move the result
+            wrapped = tools[0].wrapped
+            result = _.Shape.cast(wrapped.Located(wrapped.Location()))
+            if isinstance(result, _.Compound):
+                result = result.unwrap(fully=True)
+            return result, {face: 0 for face in result.faces()}, None
+
+        arguments, tools_offset = [tools[0]], 1
+    else:
+        arguments, tools_offset = [obj], 0
+
+    settings = config.Config()
+    operation = _get_operation(boolean_type)
+    operation.SetArguments(_to_list(arguments))
+    operation.SetTools(_to_list(tools[tools_offset:]))
+    operation.SetRunParallel(settings.BOOLEAN_PARALLEL if parallel is None else parallel)
+    operation.SetFuzzyValue(settings.BOOLEAN_FUZZY if fuzzy is None else fuzzy)
+    operation.SetUseOBB(settings.BOOLEAN_OBB if obb is None else obb)
+    operation.Build()
+
+    if not operation.IsDone():
+        raise ValueError(f"Unable to apply the { boolean_type.name } operation.")
+
+    if clean is None:
+        clean = boolean_type != BooleanType.CUT
+
+    if clean:
+        faces_amount = _count_shapes(operation.Shape(), TopAbs_FACE)
+        edges_amount = _count_shapes(operation.Shape(), TopAbs_EDGE)
+        operation.SimplifyResult()
+
+    result = _.Shape.cast(operation.Shape())
+    if isinstance(result, _.Compound):
+        result = result.unwrap(fully=True)
+
+    faces_tools: dict[_.Face, int] = {}
+    tools_faces = [(0, face) for face in arguments[0].faces()] if tools_offset else []
+
+    for tool_idx, tool in enumerate(tools[tools_offset:], tools_offset):
+        tools_faces += [(tool_idx, face) for face in tool.faces()]
+
+    for tool_idx, face in tools_faces:
+        for image in _get_images(operation, face):
+            faces_tools[image] = tool_idx
+
+    if not clean:
+        return result, faces_tools, None
+
+    return result, faces_tools, Unification(
+        _get_merged_faces(operation, obj, tools_faces) if not tools_offset else {},
+        faces_amount - _count_shapes(result.wrapped, TopAbs_FACE),
+        edges_amount - _count_shapes(result.wrapped, TopAbs_EDGE),
+    )
+
+
+def _get_merged_faces(
+        operation: BRepAlgoAPI_BooleanOperation,
+        obj: _.Part,
+        tools_faces: list[tuple[int, _.Face]],
+    ) -> dict[_.Face, _.Face]:
+    """Return, for each face of the cleaned result merged from several faces
+    including faces of the object, the largest of these object faces."""
+
+    sources: dict[_.Face, list[_.Face]] = {}
+
+    for face in obj.faces():
+        for image in _get_images(operation, face):
+            sources.setdefault(image, []).append(face)
+
+    sources_amount = {image: len(faces) for image, faces in sources.items()}
+
+    for _tool_idx, face in tools_faces:
+        for image in _get_images(operation, face):
+            if image in sources_amount:
+                sources_amount[image] += 1
+
+    return {
+        image: max(faces, key=lambda face: face.area)
+        for image, faces in sources.items()
+        if sources_amount[image] > 1
+    }
@@ -1,90 +1,508 @@
 """Module containing the Builder class."""
 from __future__ import annotations
+from collections.abc import Iterator
+from functools import wraps
 from os import PathLike
 from sys import stdout
-from typing import Iterable
+from time import perf_counter
+from typing import Any, Callable, Iterable, TypeAlias
+import inspect
 
 import build123d as _
 from tabulate import tabulate
 
 from .mutation import Mutation
+from .booleans import BooleanType, boolean
+from .parallel import fuse_parts
+from .cache import MutationCache, hash_part, hash_location
+from .storage import save_builder, load_builder
 from .mode import Mode, ModeType, cast_mode, AUTO, DEBUG
-from .colors import color_to_str, get_rvb, ColorLike
-from .shapes import Hash, ShapeList, add_shape_hash
+from .colors import PaletteMode, color_to_str, get_rvb, ColorLike
+from .shapes import (
+    Hash, ShapeLike, ShapeList, ShapePattern, ShapeState, add_shape_hash,
+    hash_shape
+)
 from . import config
 
 
+PartsLike: TypeAlias = (
+    "Builder | _.Part | " # a single part
+    "list[Builder | _.Part | tuple[Builder | _.Part, Mode | ColorLike]]" # parts
+)
+
+
+class FacesChanges:
+    """The faces to show that changed on a builder since a given token."""
+
+    def __init__(
+        self,
+        token: int,
+        faces_added: list[_.Face],
+        faces_recolored: list[_.Face],
+        faces_removed: list[Hash],
+    ) -> None:
+        self.token = token
+        self.faces_added = faces_added
+        self.faces_recolored = faces_recolored
+        self.faces_removed = faces_removed
+
+    def __repr__(self):
+        return (
+            f"FacesChanges(+{ len(self.faces_added) }, "
+            f"~{ len(self.faces_recolored) }, -{ len(self.faces_removed) })"
+        )
+
+
+class BuilderStep:
+    """The state of a builder after a given mutation (see Builder.at): the
+    mutation, and the faces to show at this step with their colors. Calling
+    it returns the colored faces, as calling the builder does."""
+
+    def __init__(
+        self,
+        mutation: Mutation,
+        faces: dict[Hash, _.Face],
+        faces_colors: dict[Hash, _.Color],
+    ) -> None:
+        self.mutation = mutation
+        self.index = mutation.index
+        self.faces = faces
+        self.faces_colors = faces_colors
+
+    @property
+    def object(self) -> _.Part:
+        """Return the object at this step."""
+        return self.mutation.object
+
+    def __call__(self) -> list[_.Face]:
+        faces = []
+
+        for face_hash, color in self.faces_colors.items():
+            face = _.Face(self.faces[face_hash].wrapped, face_hash[:6])
+            face.color = color
+            faces.append(face)
+
+        return faces
+
+    def __repr__(self):
+        return f"BuilderStep({ self.mutation.id }, { len(self.faces_colors) } faces)"
+
+
+class BuilderEvent:
+    """An event sent to the subscribers of a builder after a mutation, an undo
+    or a debug call: its kind ('mutation', 'undo' or 'debug'), the index of
+    the mutation applied or undone (or of the last mutation when debugging),
+    the hashes of the faces and edges added, altered and removed by this
+    mutation, the new colors of the faces to show that were added or
+    recolored, and the hashes of the faces that are no longer shown."""
+
+    def __init__(
+        self,
+        kind: str,
+        index: int,
+        mutation: Mutation | None,
+        colors: dict[Hash, _.Color],
+        hidden: list[Hash],
+    ) -> None:
+        self.kind = kind
+        self.index = index
+        self.faces_added = mutation.faces_added.hashes() if mutation else []
+        self.faces_altered = mutation.faces_altered.hashes() if mutation else []
+        self.faces_removed = mutation.faces_removed.hashes() if mutation else []
+        self.edges_added = mutation.edges_added.hashes() if mutation else []
+        self.edges_altered = mutation.edges_altered.hashes() if mutation else []
+        self.edges_removed = mutation.edges_removed.hashes() if mutation else []
+        self.colors = colors
+        self.hidden = hidden
+
+    def __repr__(self):
+        return (
+            f"BuilderEvent({ self.kind }, { self.index }, "
+            f"f+{ len(self.faces_added) } f~{ len(self.faces_altered) } "
+            f"f-{ len(self.faces_removed) }, { len(self.colors) } colors, "
+            f"{ len(self.hidden) } hidden)"
+        )
+
+
+def mutation_method(method):
+    """Decorator of the builder methods producing a mutation, used to measure
+    the time spent on the whole mutation, including nested method calls, and
+    to record the method name and arguments of the outermost call in the
+    mutation inputs, so it can be replayed (see Builder.replay)."""
+
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self: Builder, *args, **kwargs):
+        if self._mutation_depth > 0:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        for name, value in bound.arguments.items():
+            if isinstance(value, Iterator): # keep the consumed values
+                bound.arguments[name] = list(value)
+
+        self._mutation_start = perf_counter()
+        self._mutation_depth += 1
+        try:
+            mutation = method(*bound.args, **bound.kwargs)
+        finally:
+            self._mutation_depth -= 1
+
+        del bound.arguments["self"]
+        mutation.inputs = (method.__name__, dict(bound.arguments))
+        self._notify('mutation', mutation)
+        return mutation
+
+    return wrapper
+
+
+FORK_COPIERS: dict[str, Callable[[Any], Any]] = {
+    # functions used by forks to copy the containers they share before
+    # modifying them (inner sets and lists are modified too)
+    "mutations": list.copy,
+    "faces_dict": lambda faces: faces.copy(),
+    "faces_modes": dict.copy,
+    "_faces_mutations": dict.copy,
+    "_modes_faces": lambda modes: {key: set(faces) for key, faces in modes.items()},
+    "_mutations_faces": lambda faces: {key: set(hashes) for key, hashes in faces.items()},
+    "_mutations_ids": dict.copy,
+    "_mutations_names": lambda names: {key: list(muts) for key, muts in names.items()},
+    "_journal": lambda journal: [list(entries) for entries in journal],
+    "_faces_dirty": set.copy,
+    "_faces_colors": dict.copy,
+    "_faces_shown": dict.copy,
+    "_faces_changes": list.copy,
+    "_palette": list.copy,
+}
+
+# containers modified when applying or undoing a mutation, and when debugging
+HISTORY_CONTAINERS = (
+    "mutations", "faces_dict", "faces_modes", "_faces_mutations", "_modes_faces",
+    "_mutations_faces", "_mutations_ids", "_mutations_names", "_journal",
+    "_faces_dirty",
+)
+
+# containers modified when updating the faces colors
+COLORS_CONTAINERS = (
+    "_faces_dirty", "_faces_colors", "_faces_shown", "_faces_changes", "_palette",
+)
+
+
 class Builder:
     """A class used to manipulate Build123d objects that keeps track of each
-    mutation and manage shape colors."""
+    mutation and manage shape colors. The configuration options are resolved
+    once, when creating the builder (see config.Config), and the given options
+    override them."""
 
-    def __init__(self):
+    def __init__(self, **options):
 
+        self.config = config.Config(**options)
         self.object = _.Part(None)
         self.mutations: list[Mutation] = []
         self.faces_modes: dict[Hash, Mode] = {}
         self.faces_dict: dict[Hash, _.Face] = {}
 
+        self._faces_mutations: dict[Hash, int] = {}
+        self._modes_faces: dict[ModeType, set[Hash]] = {
+            mode_type: set() for mode_type in ModeType
+        }
+        self._mutations_faces: dict[int, set[Hash]] = {}
+        self._mutations_ids: dict[str, Mutation] = {}
+        self._mutations_names: dict[str, list[Mutation]] = {}
+        self._journal: list[list[tuple[str, Hash, object]]] = []
+        self._faces_dirty: set[Hash] = set()
+        self._faces_colors: dict[Hash, _.Color] = {}
+        self._faces_shown: dict[Hash, _.Face] = {}
+        self._colors_key: tuple | None = None
+        self._palette: list[_.Color] = []
+        self._palette_key: tuple | None = None
+        self._faces_changes: list[dict[Hash, ShapeState]] = []
+        self._mutation_depth = 0
+        self._mutation_start = 0.0
+        self._shared: set[str] = set()
+        self._subscribers: list[Callable[[BuilderEvent], None]] = []
+        self._steps: dict[int, tuple[tuple, BuilderStep]] = {}
+
+    def __getstate__(self) -> dict:
+        """Return the state of the builder, used to pickle it, once the faces
+        colors are up to date. The object,
+        the faces dict and the indexes are not included since they are
+        rebuilt from the mutations, colors are stored as tuples, and sets and
+        dicts filled from sets are sorted so the state is deterministic."""
+
+        self._update_faces()
+        state = self.__dict__.copy()
+
+        for key in (
+            "object", "faces_dict", "_modes_faces", "_mutations_ids",
+            "_mutations_names", "_faces_dirty", "_faces_shown", "_colors_key",
+            "_palette", "_palette_key", "_mutation_depth", "_mutation_start",
+            "_shared", "_subscribers", "_steps"
+        ):
+            del state[key]
+
+        state["_faces_colors"] = {
+            face_hash: self._faces_colors[face_hash].to_tuple()
+            for face_hash in sorted(self._faces_colors)
+        }
+        state["_mutations_faces"] = {
+            mut_idx: sorted(faces_hashes)
+            for mut_idx, faces_hashes in self._mutations_faces.items()
+        }
+        state["_faces_changes"] = [
+            dict(sorted(changes.items())) for changes in self._faces_changes
+        ]
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restore the builder from the given state, without computing any
+        hash."""
+
+        self.__init__()
+        self.__dict__.update(state)
+
+        for previous, mutation in zip([None] + self.mutations, self.mutations):
+            mutation.previous = previous
+            self._mutations_ids[mutation.id] = mutation
+            self._mutations_names.setdefault(mutation.name, []).append(mutation)
+
+            for face in mutation.faces_added + mutation.faces_altered:
+                self.faces_dict.setdefault(face.label, face)
+
+        for face_hash, mode in self.faces_modes.items():
+            self._modes_faces[mode.mode_type].add(face_hash)
+
+        self._mutations_faces = {
+            mut_idx: set(faces_hashes)
+            for mut_idx, faces_hashes in state["_mutations_faces"].items()
+        }
+
+        for face_hash, rgba in state["_faces_colors"].items():
+            face = self.faces_dict[face_hash]
+            self._faces_colors[face_hash] = _.Color(*rgba)
+            self._faces_shown[face_hash] = _.Face(face.wrapped, face_hash[:6])
+            self._faces_shown[face_hash].color = self._faces_colors[face_hash]
+
+        self.object = self.last.object if self.mutations else _.Part(None)
+
     def __getitem__(self, mut_idx: int):
         return self.mutations[mut_idx]
 
-    def get_faces_colors(self) -> dict[Hash, _.Color]:
-        """Build a dict containing for each face hash, its actual color."""
+    def fork(self) -> Builder:
+        """Return a new builder with the same mutations, faces and modes, that
+        can be mutated independently. Containers are shared by both builders
+        and copied by the first one that modifies them, so forking a builder
+        doesn't copy anything, and no shape nor hash is ever copied."""
+
+        fork = object.__new__(type(self))
+        fork.__dict__.update(self.__dict__)
+        fork.config = config.Config(**self.config.__dict__)
+        fork._subscribers = []
+        fork._steps = {}
+        self._shared = set(FORK_COPIERS)
+        fork._shared = set(FORK_COPIERS)
+        return fork
+
+    def _unshare(self, *names: str):
+        """Copy the given containers if they are shared with a fork, before
+        modifying them."""
+
+        for name in self._shared.intersection(names):
+            setattr(self, name, FORK_COPIERS[name](getattr(self, name)))
+            self._shared.discard(name)
+
+    def get_palette(self) -> list[_.Color]:
+        """Return the auto color of each mutation. In golden mode, the colors of
+        new mutations are appended to the palette, otherwise it is rebuilt
+        when the amount of mutations changes."""
+
+        amount = len(self.mutations)
+        self._unshare("_palette")
+
+        if self.config.PALETTE_MODE == PaletteMode.GOLDEN:
+            palette_key = (self.config.COLOR_PALETTE, self.config.PALETTE_MODE)
+            if palette_key != self._palette_key:
+                self._palette = []
+                self._palette_key = palette_key
+
+            self._palette += [
+                self.config.COLOR_PALETTE.get_golden_color(mut_idx)
+                for mut_idx in range(len(self._palette), amount)
+            ]
+            del self._palette[amount:]
+            return self._palette
+
+        palette_key = (self.config.COLOR_PALETTE, self.config.PALETTE_MODE, amount)
+        if palette_key != self._palette_key:
+            self._palette = self.config.COLOR_PALETTE.build_palette(amount)
+            self._palette_key = palette_key
+
+        return self._palette
+
+    def _get_face_color(self, face_hash: Hash, palette: list[_.Color]) -> _.Color:
+        """Return the actual color of the face identified by the given hash."""
+
+        return self._compute_face_color(
+            face_hash,
+            self.faces_modes[face_hash],
+            self._faces_mutations[face_hash],
+            self._modes_faces[ModeType.DEBUG],
+            palette,
+        )
 
-        palette = config.COLOR_PALETTE.build_palette(len(self.mutations))
-        faces_mutations = self.get_faces_mutations()
-        faces_last = self.last.faces.hashes()
+    def _compute_face_color(
+            self,
+            face_hash: Hash,
+            mode: Mode,
+            mut_idx: int,
+            faces_debug: set[Hash],
+            palette: list[_.Color],
+        ) -> _.Color:
+        """Return the color of the face identified by the given hash, with the
+        given mode, mutation index and faces in debug mode."""
+
+        color = mode.get_color(palette[mut_idx], self.config)
+
+        if faces_debug and face_hash not in faces_debug:
+            return _.Color(*get_rvb(color), self.config.DEBUG_ALPHA)
+
+        return color
+
+    def _get_colors_key(self) -> tuple:
+        """Return the values the faces colors depend on, apart from the faces
+        modes and mutations, once the palette is up to date."""
+
+        return (
+            self._palette_key,
+            self.config.DEBUG_ALPHA,
+            self.config.DEFAULT_COLOR.to_tuple(),
+            self.config.DEFAULT_DEBUG_COLOR.to_tuple(),
+        )
 
-        def get_color(face_hash):
-            mode = self.faces_modes[face_hash]
-            mut_idx = faces_mutations[face_hash]
-            return mode.get_color(palette[mut_idx])
+    def _update_faces(self) -> dict[Hash, ShapeState]:
+        """Update the cached faces colors and the faces to show, and log the
+        changes. All colors are computed again only when the palette, the
+        configuration or the debug state changed, otherwise only the faces
+        affected by the last mutations or debug calls are updated. Return the
+        changes of the faces to show."""
+
+        self._unshare(*COLORS_CONTAINERS)
+        palette = self.get_palette()
+        faces_debug = self._modes_faces[ModeType.DEBUG]
+        colors_key = (*self._get_colors_key(), bool(faces_debug))
+
+        if colors_key != self._colors_key:
+            self._colors_key = colors_key
+            self._faces_dirty.update(self._faces_colors)
+            self._faces_dirty.update(self.last.faces.hashes() if self.mutations else [])
+            self._faces_dirty.update(faces_debug)
+
+        faces_state = self.last.faces_state if self.mutations else {}
+        changes: dict[Hash, ShapeState] = {}
+
+        for face_hash in self._faces_dirty:
+            old_color = self._faces_colors.pop(face_hash, None)
+
+            if (
+                face_hash not in faces_debug
+                and faces_state.get(face_hash, ShapeState.REMOVED) == ShapeState.REMOVED
+            ):
+                if old_color is not None:
+                    del self._faces_shown[face_hash]
+                    changes[face_hash] = ShapeState.REMOVED
+                continue
+
+            color = self._get_face_color(face_hash, palette)
+            self._faces_colors[face_hash] = color
+
+            if old_color is None:
+                changes[face_hash] = ShapeState.ADDED
+            elif color.to_tuple() != old_color.to_tuple():
+                changes[face_hash] = ShapeState.ALTERED
+            else:
+                continue
 
-        faces_debug = {
-            face_hash: mode.color
-            for face_hash, mode in self.faces_modes.items()
-            if mode.mode_type == ModeType.DEBUG
-        }
+            # faces to show are replaced instead of being modified, so they can be shared by forks
+            face = self.faces_dict[face_hash]
+            self._faces_shown[face_hash] = _.Face(face.wrapped, face_hash[:6])
+            self._faces_shown[face_hash].color = color
 
-        if faces_debug:
-            ghost_colors = {
-                fg_h: _.Color(*get_rvb(get_color(fg_h)), config.DEBUG_ALPHA)
-                for fg_h in faces_last
-            }
-            return {
-                **ghost_colors,
-                **faces_debug,
-            }
+        self._faces_dirty = set()
+
+        if changes:
+            self._faces_changes.append(changes)
 
-        return {fl_h: get_color(fl_h) for fl_h in faces_last}
+        return changes
+
+    def get_faces_colors(self) -> dict[Hash, _.Color]:
+        """Return a dict containing for each face hash, its actual color.
+        The returned dict is cached by the builder and must not be modified."""
+
+        self._update_faces()
+        return self._faces_colors
 
     def __call__(self) -> list[_.Face]:
         if not self.mutations:
             raise ValueError("No mutation to show.")
 
-        faces_colors = self.get_faces_colors()
-        faces_to_show: list[_.Face] = []
+        self._update_faces()
+        return list(self._faces_shown.values())
 
-        for face_hash, face_color in faces_colors.items():
-            face = self.faces_dict[face_hash]
-            face.color = face_color
-            face.label = face_hash[:6]
-            faces_to_show.append(face)
+    def changes(self, since: int = 0) -> FacesChanges:
+        """Return the faces added, removed and recolored since the given token,
+        as returned in a previous FacesChanges (by default, since the builder
+        creation)."""
 
-        return faces_to_show
+        if not self.mutations:
+            raise ValueError("No mutation to show.")
 
-    def __iadd__(self, part: Builder | _.Part | tuple[Builder | _.Part, Mode | ColorLike]):
-        if isinstance(part, tuple):
-            self.add(*part)
+        self._update_faces()
+        faces_states: dict[Hash, ShapeState] = {}
+
+        for changes in self._faces_changes[since:]:
+            for face_hash, state in changes.items():
+                previous_state = faces_states.get(face_hash)
+
+                if previous_state == ShapeState.ADDED:
+                    if state == ShapeState.REMOVED:
+                        del faces_states[face_hash]
+                elif previous_state == ShapeState.REMOVED:
+                    faces_states[face_hash] = ShapeState.ALTERED
+                else:
+                    faces_states[face_hash] = state
+
+        def get_faces(state: ShapeState) -> list[_.Face]:
+            return [
+                self._faces_shown[face_hash]
+                for face_hash, face_state in faces_states.items()
+                if face_state == state
+            ]
+
+        return FacesChanges(
+            len(self._faces_changes),
+            get_faces(ShapeState.ADDED),
+            get_faces(ShapeState.ALTERED),
+            [
+                face_hash for face_hash, state in faces_states.items()
+                if state == ShapeState.REMOVED
+            ],
+        )
+
+    def __iadd__(self, part: PartsLike | tuple[PartsLike, Mode | ColorLike]):
+        args = part if isinstance(part, tuple) else (part,)
+        if isinstance(args[0], list):
+            self.add_many(*args)
         else:
-            self.add(part)
+            self.add(*args)
         return self
 
-    def __isub__(self, part: Builder | _.Part | tuple[Builder | _.Part, Mode | ColorLike]):
-        if isinstance(part, tuple):
-            self.sub(*part)
+    def __isub__(self, part: PartsLike | tuple[PartsLike, Mode | ColorLike]):
+        args = part if isinstance(part, tuple) else (part,)
+        if isinstance(args[0], list):
+            self.sub_many(*args)
         else:
-            self.sub(part)
+            self.sub(*args)
         return self
 
     def __imul__(self, location: _.Location | tuple[_.Location, Mode | ColorLike]):
@@ -110,41 +528,111 @@ class Builder:
         """Return a dictionnary containing for each face hash, the mutation that
         created the face."""
 
-        # TODO: store dict in builder and apply on each mutation?
-        faces_mutations: dict[Hash, int] = {}
+        return dict(self._faces_mutations)
 
-        for mutation in self.mutations:
+    def _update_faces_mutations(self, mutation: Mutation):
+        """Update the faces mutations dict with the faces of the given mutation."""
 
-            for face_ad in mutation.faces_added:
-                faces_mutations[face_ad.label] = (
-                    faces_mutations[mutation.faces_alias[face_ad.label]]
-                    if mutation.faces_alias
-                    else mutation.index
-                )
+        faces_mutations = self._faces_mutations
 
-            rm_muts = {faces_mutations[face_rm.label] for face_rm in mutation.faces_removed}
+        for face_ad in mutation.faces_added:
+            face_alias = mutation.faces_alias.get(face_ad.label)
+            self._set_face_mutation(face_ad.label, (
+                faces_mutations[face_alias] if face_alias in faces_mutations
+                else mutation.index
+            ))
 
-            if len(rm_muts) == 1:
-                rm_color = rm_muts.pop()
+        rm_muts = {faces_mutations[face_rm.label] for face_rm in mutation.faces_removed}
 
-                for face_al in mutation.faces_altered:
-                    faces_mutations[face_al.label] = rm_color
-            else:
-                for face_al in mutation.faces_altered:
-                    for face_rm in mutation.faces_removed:
-                        if Mutation.is_altered_faces(face_al, face_rm):
-                            rm_mut_idx = faces_mutations[face_rm.label]
-                            faces_mutations[face_al.label] = rm_mut_idx
+        if len(rm_muts) == 1:
+            rm_color = rm_muts.pop()
+
+            for face_al in mutation.faces_altered:
+                self._set_face_mutation(face_al.label, rm_color)
+        else:
+            faces_origins = mutation.get_faces_origins()
+
+            for face_al in mutation.faces_altered:
+                for rm_hash in faces_origins[face_al.label]:
+                    self._set_face_mutation(face_al.label, faces_mutations[rm_hash])
+
+                if not faces_origins[face_al.label]: # altered from an untouched face
+                    self._set_face_mutation(face_al.label, mutation.index)
+
+    def _record(self, kind: str, face_hash: Hash, old_value):
+        """Record the previous value of a face attribute in the journal of the
+        last mutation, so it can be restored when undoing it."""
+
+        if self._journal:
+            self._journal[-1].append((kind, face_hash, old_value))
+
+    def _set_face(self, face_hash: Hash, face: _.Face):
+        """Store the given face in the faces dict, if not already stored."""
+
+        if face_hash not in self.faces_dict:
+            self._record('face', face_hash, None)
+            self.faces_dict[face_hash] = face
+
+    def _set_face_mutation(self, face_hash: Hash, mut_idx: int):
+        """Set the index of the mutation that created the given face."""
+
+        self._record('mutation', face_hash, self._faces_mutations.get(face_hash))
+        self._faces_mutations[face_hash] = mut_idx
 
-        return faces_mutations
+    def _set_face_mode(self, face_hash: Hash, mode: Mode | None, record=True):
+        """Set the mode of the face identified by the given hash (or remove it
+        if mode is None), and mark it for a color update."""
+
+        old_mode = self.faces_modes.get(face_hash)
+        if record:
+            self._record('mode', face_hash, old_mode)
+
+        if old_mode:
+            self._modes_faces[old_mode.mode_type].discard(face_hash)
+
+        if mode:
+            self.faces_modes[face_hash] = mode
+            self._modes_faces[mode.mode_type].add(face_hash)
+        else:
+            del self.faces_modes[face_hash]
+
+        self._faces_dirty.add(face_hash)
+
+    def _update_mutations_faces(self, mutation: Mutation):
+        """Update the live faces of each mutation with the given mutation."""
+
+        for face_hash in mutation.faces_removed.hashes():
+            mut_idx = self._faces_mutations[face_hash]
+            self._mutations_faces[mut_idx].discard(face_hash)
+
+        for face_hash in mutation.faces_added.hashes() + mutation.faces_altered.hashes():
+            mut_idx = self._faces_mutations[face_hash]
+            self._mutations_faces.setdefault(mut_idx, set()).add(face_hash)
 
     def get_mutation(self, mutation_id: str) -> Mutation:
         """Return the mutation identified by the given id."""
 
-        for mutation in self.mutations:
-            if mutation.id == mutation_id:
-                return mutation
-        raise KeyError
+        return self._mutations_ids[mutation_id]
+
+    def get_mutations(self, name: str) -> list[Mutation]:
+        """Return the mutations with the given name (ex: 'fillet')."""
+
+        return list(self._mutations_names.get(name, []))
+
+    def get_mutation_faces(self, mutation: Mutation | int) -> ShapeList[_.Face]:
+        """Return the faces of the current object that were created by the
+        given mutation (or mutation index)."""
+
+        mut_idx = mutation if isinstance(mutation, int) else mutation.index
+        faces_hashes = self._mutations_faces.get(mut_idx, set())
+        return ShapeList(self.faces_dict[face_hash] for face_hash in faces_hashes)
+
+    def get_mode_faces(self, mode_type: ModeType) -> ShapeList[_.Face]:
+        """Return the faces that are in the given mode type (ex: ModeType.DEBUG),
+        including removed faces."""
+
+        faces_hashes = self._modes_faces[mode_type]
+        return ShapeList(self.faces_dict[face_hash] for face_hash in faces_hashes)
 
     @classmethod
     def _cast_faces(cls, faces: Iterable[_.Face] | _.Face) -> ShapeList[_.Face]:
@@ -170,45 +658,403 @@ class Builder:
 
         return ShapeList(edges)
 
+    def get_shapes_labels(self) -> dict[ShapeLike, Hash]:
+        """Return a dict containing the hash of each face, edge and vertex of
+        the current object, used to reuse them when the builder is passed to
+        an other builder mutation."""
+
+        return {
+            shape: shape.label
+            for shape_type in (_.Face, _.Edge, _.Vertex)
+            for shape in self.last.get_shapes(shape_type)
+        }
+
+    def get_fixed_modes(self) -> dict[Hash, Mode]:
+        """Return a dict containing, for each face of the current object, its
+        mode where auto colors are replaced by the actual color, so the faces
+        keep their colors when the builder is passed to an other builder
+        mutation."""
+
+        palette = self.get_palette()
+        fixed_modes: dict[Hash, Mode] = {}
+
+        for face_hash in self.last.faces.hashes():
+            mode = self.faces_modes[face_hash]
+            if mode.mode_type == ModeType.AUTO:
+                color = palette[self._faces_mutations[face_hash]]
+                mode = Mode(ModeType.FIXED, color)
+            fixed_modes[face_hash] = mode
+
+        return fixed_modes
+
     @classmethod
     def _cast_part(cls, part: Builder | _.Part) -> _.Part:
         """Cast an EdgeListLike to a Edge iterable."""
         return part if isinstance(part, _.Part) else part.object
 
+    @mutation_method
     def mutate(
             self,
             name: str,
             obj: _.Part,
             mode: Mode | ColorLike,
-            faces_alias: dict[Hash, Hash] | None=None
+            faces_alias: dict[Hash, Hash] | None=None,
+            faces_tools: dict[_.Face, int] | None=None,
+            shapes_labels: dict[ShapeLike, Hash] | None=None
         ) -> Mutation:
         """Base mutation: mutate the current object to the given one by applying
         a mutation with the given name, color and debug mode."""
 
-        self.object = obj
+        mutation = self._create_mutation(name, obj, faces_alias, faces_tools, shapes_labels)
+        return self._apply_mutation(mutation, cast_mode(mode))
+
+    def _create_mutation(
+            self,
+            name: str,
+            obj: _.Part,
+            faces_alias: dict[Hash, Hash] | None=None,
+            faces_tools: dict[_.Face, int] | None=None,
+            shapes_labels: dict[ShapeLike, Hash] | None=None
+        ) -> Mutation:
+        """Compute the mutation from the current object to the given one,
+        without applying it."""
 
         # TODO: remove faces_alias from mutation and pass them to builder faces?
-        mutation = Mutation(
+        return Mutation(
             obj,
             self.last if self.mutations else None,
             name,
             len(self.mutations),
             faces_alias,
+            faces_tools,
+            shapes_labels,
+            self.config.DIFF_WORKERS,
         )
 
+    def _apply_mutation(self, mutation: Mutation, mode: Mode) -> Mutation:
+        """Apply the given mutation with the given mode: update the object, the
+        faces and the indexes of the builder."""
+
+        self._unshare(*HISTORY_CONTAINERS)
+        self.object = mutation.object
+        self._journal.append([])
+
         for face in mutation.faces_added + mutation.faces_altered:
-            if face.label not in self.faces_dict:
-                self.faces_dict[face.label] = face
+            self._set_face(face.label, face)
+
+        self._update_faces_mutations(mutation)
+        self._update_mutations_faces(mutation)
 
         for face in mutation.faces_added:
-            self.faces_modes[face.label] = cast_mode(mode)
+            self._set_face_mode(face.label, mode)
 
         for face in mutation.faces_altered:
-            self.faces_modes[face.label] = AUTO
+            self._set_face_mode(face.label, AUTO)
 
+        self._faces_dirty.update(mutation.faces_removed.hashes())
+        mutation.duration = perf_counter() - self._mutation_start
         self.mutations.append(mutation)
+        self._mutations_ids[mutation.id] = mutation
+        self._mutations_names.setdefault(mutation.name, []).append(mutation)
         return mutation
 
+    def _get_object_hash(self) -> str:
+        """Return an exact hash of the current object: the cache key of the
+        last mutation, which identifies the whole chain of mutations leading
+        to it, or the hash of the object BREP if it was not cached. Shapes
+        hashes can't be used, since they are rounded."""
+
+        if not self.mutations:
+            return ""
+
+        if self.last.cache_key is not None:
+            return self.last.cache_key
+
+        return hash_part(self.object)
+
+    def _mutate_cached(
+            self,
+            name: str,
+            mode: Mode | ColorLike,
+            get_params: Callable[[], tuple],
+            compute: Callable[[], Mutation],
+        ) -> Mutation:
+        """Apply a mutation with the given name and mode, computed with the
+        given function. If a cache is configured (see config.CACHE), the
+        mutation is loaded from the entry identified by the current object,
+        the mutation name and the parameters returned by the given function,
+        otherwise it is computed, applied then cached."""
+
+        cache: MutationCache | None = self.config.CACHE
+
+        if cache is None:
+            return self._apply_mutation(compute(), cast_mode(mode))
+
+        key = cache.get_key(self._get_object_hash(), name, get_params())
+        state = cache.get(key)
+
+        if state is not None:
+            previous = self.last if self.mutations else None
+            mutation = Mutation.from_state(state, previous, len(self.mutations))
+            mutation.cache_key = key
+            return self._apply_mutation(mutation, cast_mode(mode))
+
+        mutation = self._apply_mutation(compute(), cast_mode(mode))
+        mutation.cache_key = key
+        cache.set(key, mutation.__getstate__())
+        return mutation
+
+    def undo(self) -> Mutation:
+        """Undo the last mutation without computing anything again, and return
+        it. Faces modes set with the debug method after this mutation are
+        undone as well."""
+
+        if not self.mutations:
+            raise IndexError("No mutation to undo.")
+
+        self._unshare(*HISTORY_CONTAINERS)
+        mutation = self.mutations[-1]
+        added_hashes = mutation.faces_added.hashes() + mutation.faces_altered.hashes()
+        removed_hashes = mutation.faces_removed.hashes()
+
+        for face_hash in added_hashes:
+            self._mutations_faces[self._faces_mutations[face_hash]].discard(face_hash)
+
+        self._mutations_faces.pop(mutation.index, None)
+
+        for kind, face_hash, old_value in reversed(self._journal.pop()):
+            if kind == 'face':
+                del self.faces_dict[face_hash]
+            elif kind == 'mutation':
+                if old_value is None:
+                    del self._faces_mutations[face_hash]
+                else:
+                    self._faces_mutations[face_hash] = old_value
+            else:
+                self._set_face_mode(face_hash, old_value, False)
+
+        for face_hash in removed_hashes:
+            mut_idx = self._faces_mutations[face_hash]
+            self._mutations_faces.setdefault(mut_idx, set()).add(face_hash)
+
+        self._faces_dirty.update(added_hashes + removed_hashes)
+        self.mutations.pop()
+        del self._mutations_ids[mutation.id]
+        self._mutations_names[mutation.name].pop()
+        if not self._mutations_names[mutation.name]:
+            del self._mutations_names[mutation.name]
+        self.object = self.last.object if self.mutations else _.Part(None)
+        self._notify('undo', mutation)
+        return mutation
+
+    def at(self, mut_idx: int) -> BuilderStep:
+        """Return the state of the builder after the mutation at the given
+        index, including the debug modes set before the next mutation. Faces
+        colors are restored from the journal of the following mutations,
+        without computing any shape, and cached for each step, so going back
+        and forth through the history is fast."""
+
+        mut_idx = self._get_mutation_index(mut_idx)
+        mutation = self.mutations[mut_idx]
+        palette = self.get_palette()
+        step_key = (mutation, len(self._journal[mut_idx]), self._get_colors_key())
+
+        cached = self._steps.get(mut_idx)
+        if cached is not None and cached[0] == step_key:
+            return cached[1]
+
+        faces_mutations: dict[Hash, int | None] = {}
+        faces_modes: dict[Hash, Mode | None] = {}
+
+        for entries in self._journal[mut_idx + 1:]:
+            for kind, face_hash, old_value in entries:
+                if kind == 'mutation':
+                    faces_mutations.setdefault(face_hash, old_value) # type: ignore
+                elif kind == 'mode':
+                    faces_modes.setdefault(face_hash, old_value) # type: ignore
+
+        def get_mode(face_hash: Hash) -> Mode | None:
+            if face_hash in faces_modes:
+                return faces_modes[face_hash]
+            return self.faces_modes.get(face_hash)
+
+        faces = {face.label: face for face in mutation.faces}
+        faces_debug = {
+            face_hash
+            for face_hash in self._modes_faces[ModeType.DEBUG] | faces_modes.keys()
+            if (mode := get_mode(face_hash)) and mode.mode_type == ModeType.DEBUG
+        }
+
+        for face_hash in faces_debug - faces.keys():
+            faces[face_hash] = self.faces_dict[face_hash]
+
+        faces_colors = {
+            face_hash: self._compute_face_color(
+                face_hash,
+                get_mode(face_hash), # type: ignore
+                faces_mutations[face_hash] if face_hash in faces_mutations
+                else self._faces_mutations[face_hash], # type: ignore
+                faces_debug,
+                palette,
+            )
+            for face_hash in faces
+        }
+
+        step = BuilderStep(mutation, faces, faces_colors)
+        self._steps[mut_idx] = (step_key, step)
+        return step
+
+    def rollback(self, mut_idx: int):
+        """Restore the builder to its state after the mutation at the given
+        index, by undoing all the following mutations."""
+
+        if not -len(self.mutations) <= mut_idx < len(self.mutations):
+            raise IndexError(f"No mutation at index { mut_idx }.")
+
+        for _idx in range(len(self.mutations) - mut_idx % len(self.mutations) - 1):
+            self.undo()
+
+    def replay(self, changes: dict[int | str, dict[str, Any]]) -> list[Mutation]:
+        """Apply again the mutations with the given changes of arguments, given
+        for each changed mutation (identified by its index or its id) as a dict
+        of arguments names and values, ex: {'fillet-3': {'radius': 0.2}}.
+
+        The mutations before the first changed one are kept as is, the
+        following ones are undone then applied again with their recorded
+        inputs, so the faces get the same attributions as in a full rebuild.
+        The edges and faces passed to a replayed mutation are taken from the
+        replayed object by hash, so they must not be affected by the changes.
+        Debug modes set after the first changed mutation are not replayed.
+        If a mutation fails to be replayed, the builder is restored as it was
+        before the call and the error is raised. Return the replayed
+        mutations."""
+
+        changes = {
+            self._get_mutation_index(key): arguments
+            for key, arguments in changes.items()
+        }
+
+        if not changes:
+            return []
+
+        first_idx = min(changes)
+        mutations = self.mutations[first_idx:]
+
+        for mutation in mutations:
+            if mutation.inputs is None:
+                raise ValueError(
+                    f"Mutation { mutation.id } can't be replayed: its inputs were not recorded."
+                )
+
+        inputs = [
+            self._change_inputs(*mutation.inputs, changes.get(mutation.index, {}))
+            for mutation in mutations
+        ]
+
+        snapshot = self.fork()
+
+        try:
+            while len(self.mutations) > first_idx:
+                self.undo()
+
+            return [self._replay_inputs(method_name, bound) for method_name, bound in inputs]
+        except BaseException:
+            self._restore(snapshot)
+            raise
+
+    def _restore(self, snapshot: Builder):
+        """Restore the history of the builder from the given fork of it. The
+        faces colors are kept and the faces that may have changed are marked
+        for a color update, so subscribers are notified of the differences
+        with what they were last sent."""
+
+        faces_dirty = set(self._faces_colors)
+
+        for name in HISTORY_CONTAINERS:
+            setattr(self, name, getattr(snapshot, name))
+
+        # the restored containers may still be shared with previous forks
+        self._shared.update(snapshot._shared.intersection(HISTORY_CONTAINERS))
+        self._unshare("_faces_dirty")
+        self._faces_dirty.update(faces_dirty)
+        self._faces_dirty.update(self._modes_faces[ModeType.DEBUG])
+        self._faces_dirty.update(self.last.faces.hashes() if self.mutations else [])
+        self.object = snapshot.object
+        self._notify('undo', None)
+
+    def _get_mutation_index(self, key: int | str) -> int:
+        """Return the index of the mutation identified by the given index or
+        id."""
+
+        if isinstance(key, str):
+            return self.get_mutation(key).index
+
+        if not -len(self.mutations) <= key < len(self.mutations):
+            raise IndexError(f"No mutation at index { key }.")
+
+        return key % len(self.mutations)
+
+    def _change_inputs(
+            self,
+            method_name: str,
+            arguments: dict[str, Any],
+            changes: dict[str, Any],
+        ) -> tuple[str, inspect.BoundArguments]:
+        """Return the method name and the arguments of a call to the given mutation method, built
+        from the given recorded arguments and changes. Changes that are not
+        parameters of the method are passed as its keyword arguments (such as
+        the boolean options)."""
+
+        signature = inspect.signature(getattr(self, method_name))
+        parameters = signature.parameters
+        arguments = dict(arguments)
+        var_keyword = next((
+            param.name for param in parameters.values()
+            if param.kind == inspect.Parameter.VAR_KEYWORD
+        ), None)
+
+        for name, value in changes.items():
+            if name in parameters and name != var_keyword:
+                arguments[name] = value
+            elif var_keyword:
+                arguments[var_keyword] = {**arguments.get(var_keyword, {}), name: value}
+            else:
+                raise ValueError(f"Unknown argument '{ name }' for the { method_name } method.")
+
+        return method_name, inspect.BoundArguments(signature, arguments)
+
+    def _replay_inputs(self, method_name: str, bound: inspect.BoundArguments) -> Mutation:
+        """Call the given mutation method with the given arguments, where the edges
+        and faces are replaced by the ones of the current object that have
+        the same hash."""
+
+        for name, value in bound.arguments.items():
+            if isinstance(value, (_.Edge, _.Face)):
+                bound.arguments[name] = self._find_shapes([value])[0]
+            elif isinstance(value, list) and value and all(
+                isinstance(shape, (_.Edge, _.Face)) for shape in value
+            ):
+                bound.arguments[name] = self._find_shapes(value)
+
+        return getattr(self, method_name)(*bound.args, **bound.kwargs)
+
+    def _find_shapes(self, shapes: list[_.Edge | _.Face]) -> ShapeList:
+        """Return the edges or faces of the current object that have the same
+        hash than the given ones."""
+
+        current = {
+            shape.label: shape
+            for shape in (self.last.faces if isinstance(shapes[0], _.Face) else self.last.edges)
+        }
+
+        try:
+            return ShapeList(current[shape.label or hash_shape(shape)] for shape in shapes)
+        except KeyError as error:
+            raise ValueError(
+                f"Shape { error.args[0][:6] } was not found in the replayed object."
+            ) from error
+
+    @mutation_method
     def move(
             self,
             location: _.Location,
@@ -218,48 +1064,264 @@ class Builder:
         with the given color and debug mode.
         If not color is defined, keep the previous ones for each face."""
 
-        obj = location * self.object
-        faces_alias: dict[Hash, Hash] = {}
+        def compute() -> Mutation:
+            faces_alias: dict[Hash, Hash] = {}
+
+            for face in self.last.faces if self.mutations else []:
+                face_moved = add_shape_hash(location * face, True)
+                faces_alias[face_moved.label] = face.label
 
-        for face in ShapeList(self.object.faces()):
-            face_moved = add_shape_hash(location * face, True)
-            faces_alias[face_moved.label] = face.label
+            return self._create_mutation('move', location * self.object, faces_alias)
 
-        return self.mutate('move', obj, cast_mode(mode), faces_alias)
+        return self._mutate_cached('move', mode, lambda: (hash_location(location),), compute)
 
+    @mutation_method
     def add(
             self,
             part: Builder | _.Part,
             mode: Mode | ColorLike = AUTO,
+            **options,
         ) -> Mutation:
         """Mutation: fuse the given part to the current object.
-        with the given color and debug mode."""
+        with the given color and debug mode. Options of the boolean operation
+        (parallel, fuzzy, obb, clean) can be passed to override the configuration."""
 
-        obj = self.object + self._cast_part(part)
-        return self.mutate('add', obj, cast_mode(mode))
+        return self._mutate_many('add', BooleanType.FUSE, [part], mode, 1, **options)
 
+    @mutation_method
     def sub(
             self,
             part: Builder | _.Part,
             mode: Mode | ColorLike = AUTO,
+            **options,
         ) -> Mutation:
         """Mutation: substract the given part from the current object,
-        with the given color and debug mode."""
+        with the given color and debug mode. Options of the boolean operation
+        (parallel, fuzzy, obb, clean) can be passed to override the configuration."""
+
+        return self._mutate_many('sub', BooleanType.CUT, [part], mode, 1, **options)
+
+    def _get_boolean_options(self, options: dict) -> dict:
+        """Return the given options of a boolean operation, completed with the
+        builder configuration."""
+
+        return {
+            "parallel": self.config.BOOLEAN_PARALLEL,
+            "fuzzy": self.config.BOOLEAN_FUZZY,
+            "obb": self.config.BOOLEAN_OBB,
+            "clean": self.config.BOOLEAN_CLEAN,
+            **options,
+        }
+
+    def _create_boolean_mutation(
+            self,
+            name: str,
+            boolean_type: BooleanType,
+            tools: list[_.Part],
+            options: dict,
+            shapes_labels: dict[ShapeLike, Hash] | None=None
+        ) -> Mutation:
+        """Compute the mutation applying the given boolean operation with the
+        given tools. If the result is cleaned, faces merged from faces of the
+        current object are aliased to the largest of them, so they keep its
+        mutation and color."""
+
+        obj, faces_tools, unification = boolean(boolean_type, self.object, tools, **options)
+        mutation = self._create_mutation(name, obj, None, faces_tools, shapes_labels)
+
+        if unification is not None:
+            faces_labels = {face: face.label for face in mutation.faces}
+            previous_labels = {face: face.label for face in self.last.faces} if self.mutations else {}
+            mutation.faces_alias = {
+                faces_labels[face]: previous_labels[origin]
+                for face, origin in unification.faces_alias.items()
+                if face in faces_labels and origin in previous_labels
+            }
+            mutation.faces_unified = unification.faces_removed
+            mutation.edges_unified = unification.edges_removed
+
+        return mutation
+
+    def _mutate_many(
+            self,
+            name: str,
+            boolean_type: BooleanType,
+            parts: Iterable[Builder | _.Part | tuple[Builder | _.Part, Mode | ColorLike]],
+            mode: Mode | ColorLike,
+            workers: int | None,
+            **options,
+        ) -> Mutation:
+        """Apply the given boolean operation with all the given parts at once,
+        then set the mode of the faces added by parts given with their own
+        mode. If workers is not 1, the parts are first fused in parallel."""
+
+        tools: list[_.Part] = []
+        tools_modes: list[Mode | None] = []
+        shapes_labels: dict[ShapeLike, Hash] = {}
+        nested_modes: dict[Hash, Mode] = {}
+
+        for part in parts:
+            part, tool_mode = part if isinstance(part, tuple) else (part, None)
+            tools.append(self._cast_part(part))
+            tools_modes.append(None if tool_mode is None else cast_mode(tool_mode))
+
+            if isinstance(part, Builder) and part.mutations:
+                shapes_labels.update(part.get_shapes_labels())
+                nested_modes.update(part.get_fixed_modes())
+
+        options = self._get_boolean_options(options)
+        chunksize = self.config.FUSE_CHUNKSIZE
+        workers = self.config.FUSE_WORKERS if workers == 0 else workers
+        fuse_first = workers != 1 and len(tools) > chunksize
+
+        if fuse_first and any(tools_modes):
+            raise ValueError("Parts modes can not be used with parallel fusion.")
+
+        def compute() -> Mutation:
+            if fuse_first:
+                fused = fuse_parts(tools, workers, chunksize, **options)
+                return self._create_boolean_mutation(name, boolean_type, [fused], options)
+
+            return self._create_boolean_mutation(
+                name, boolean_type, tools, options, shapes_labels
+            )
+
+        def get_params() -> tuple:
+            tools_hashes = [hash_part(tool) for tool in tools]
+            return (boolean_type.name, tools_hashes, sorted(options.items()), fuse_first)
+
+        mode = cast_mode(mode)
+        mutation = self._mutate_cached(name, mode, get_params, compute)
+
+        for face_hash in mutation.faces_added.hashes():
+            tool_idx = mutation.faces_tools.get(face_hash)
+            if tool_idx is not None and tools_modes[tool_idx]:
+                self._set_face_mode(face_hash, tools_modes[tool_idx])
+            elif face_hash in nested_modes and mode.mode_type == ModeType.AUTO:
+                self._set_face_mode(face_hash, nested_modes[face_hash])
+
+        return mutation
+
+    @mutation_method
+    def add_many(
+            self,
+            parts: Iterable[Builder | _.Part | tuple[Builder | _.Part, Mode | ColorLike]],
+            mode: Mode | ColorLike = AUTO,
+            workers: int | None = 0,
+            **options,
+        ) -> Mutation:
+        """Mutation: fuse all the given parts to the current object at once,
+        with the given color and debug mode. Each part can be given with its
+        own color and debug mode, as a (part, mode) tuple.
+        The parts can be fused in the given amount of processes beforehand
+        (None for all CPUs, 0 to use the FUSE_WORKERS option), in this case parts
+        can't have their own mode, and faces hashes may differ from a fusion in
+        a single operation.
+        Options of the boolean operation (parallel, fuzzy, obb, clean) can be passed
+        to override the configuration."""
+
+        return self._mutate_many('add', BooleanType.FUSE, parts, mode, workers, **options)
+
+    @mutation_method
+    def sub_many(
+            self,
+            parts: Iterable[Builder | _.Part | tuple[Builder | _.Part, Mode | ColorLike]],
+            mode: Mode | ColorLike = AUTO,
+            workers: int | None = 0,
+            **options,
+        ) -> Mutation:
+        """Mutation: substract all the given parts from the current object at
+        once, with the given color and debug mode. Each part can be given with
+        its own color and debug mode, as a (part, mode) tuple.
+        The parts can be fused in the given amount of processes beforehand
+        (None for all CPUs, 0 to use the FUSE_WORKERS option), in this case parts
+        can't have their own mode, and faces hashes may differ from a fusion in
+        a single operation.
+        Options of the boolean operation (parallel, fuzzy, obb, clean) can be passed
+        to override the configuration."""
+
+        return self._mutate_many('sub', BooleanType.CUT, parts, mode, workers, **options)
+
+    def _mutate_pattern(
+            self,
+            name: str,
+            boolean_type: BooleanType,
+            part: Builder | _.Part,
+            locations: Iterable[_.Location],
+            mode: Mode | ColorLike,
+            **options,
+        ) -> Mutation:
+        """Apply the given boolean operation with copies of the given part
+        placed at each given location, at once."""
+
+        part = self._cast_part(part)
+        locations = list(locations)
+        options = self._get_boolean_options(options)
+
+        def compute() -> Mutation:
+            if boolean_type == BooleanType.CUT: # copies faces are trimmed, so hashed again anyway
+                tools = [_.Shape.cast(part.wrapped.Moved(loc.wrapped)) for loc in locations]
+                return self._create_boolean_mutation(name, boolean_type, tools, options)
+
+            tools, shapes_labels = ShapePattern(part).place(locations)
+            return self._create_boolean_mutation(
+                name, boolean_type, tools, options, shapes_labels
+            )
+
+        def get_params() -> tuple:
+            locations_hashes = [hash_location(location) for location in locations]
+            return (boolean_type.name, hash_part(part), locations_hashes, sorted(options.items()))
+
+        return self._mutate_cached(name, mode, get_params, compute)
+
+    @mutation_method
+    def add_pattern(
+            self,
+            part: Builder | _.Part,
+            locations: Iterable[_.Location],
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: fuse a copy of the given part at each given location to
+        the current object at once, with the given color and debug mode. The
+        hashes of the copies faces are derived from the part faces, which only
+        saves hashing for the faces kept as is by the fusion. Options of the
+        boolean operation (parallel, fuzzy, obb, clean) can be passed to
+        override the configuration."""
+
+        return self._mutate_pattern('add', BooleanType.FUSE, part, locations, mode, **options)
+
+    @mutation_method
+    def sub_pattern(
+            self,
+            part: Builder | _.Part,
+            locations: Iterable[_.Location],
+            mode: Mode | ColorLike = AUTO,
+            **options,
+        ) -> Mutation:
+        """Mutation: substract a copy of the given part at each given location
+        from the current object at once, with the given color and debug mode.
+        The copies faces are trimmed by the cut, so their hashes are not
+        derived from the part faces: the copies only share the part geometry.
+        Options of the boolean operation (parallel, fuzzy, obb, clean) can be
+        passed to override the configuration."""
 
-        obj = self.object - self._cast_part(part)
-        return self.mutate('sub', obj, cast_mode(mode))
+        return self._mutate_pattern('sub', BooleanType.CUT, part, locations, mode, **options)
 
+    @mutation_method
     def intersect(
             self,
             part: Builder | _.Part,
             mode: Mode | ColorLike = AUTO,
+            **options,
         ) -> Mutation:
         """Mutation: intersects the given part to the current object,
-        with the given color and debug mode."""
+        with the given color and debug mode. Options of the boolean operation
+        (parallel, fuzzy, obb, clean) can be passed to override the configuration."""
 
-        obj = self.object & self._cast_part(part)
-        return self.mutate('inter', obj, cast_mode(mode))
+        return self._mutate_many('inter', BooleanType.COMMON, [part], mode, 1, **options)
 
+    @mutation_method
     def fillet(
             self,
             edges: Iterable[_.Edge] | _.Edge,
@@ -269,9 +1331,14 @@ class Builder:
         """Mutation: apply a fillet of the given radius to the given edges of
         the current object, with the given color and debug mode."""
 
-        obj = self.object.fillet(radius, self._cast_edges(edges))
-        return self.mutate('fillet', obj, cast_mode(mode))
+        edges = self._cast_edges(edges)
+
+        def compute() -> Mutation:
+            return self._create_mutation('fillet', self.object.fillet(radius, edges))
 
+        return self._mutate_cached('fillet', mode, lambda: (radius, edges.hashes()), compute)
+
+    @mutation_method
     def chamfer(
             self,
             edges: Iterable[_.Edge] | _.Edge,
@@ -284,13 +1351,21 @@ class Builder:
         the current object, with the given color and debug mode."""
 
         edges = self._cast_edges(edges)
-        obj = self.object.chamfer(length, length2, edges, face) # type: ignore
-        return self.mutate('chamfer', obj, cast_mode(mode))
+
+        def compute() -> Mutation:
+            obj = self.object.chamfer(length, length2, edges, face) # type: ignore
+            return self._create_mutation('chamfer', obj)
+
+        def get_params() -> tuple:
+            face_hash = None if face is None else hash_shape(face)
+            return (length, length2, edges.hashes(), face_hash)
+
+        return self._mutate_cached('chamfer', mode, get_params, compute)
 
     def info(self, file=None):
         """Print the list of mutations to the given file (stdout by default)."""
 
-        palette = config.COLOR_PALETTE.build_palette(len(self.mutations))
+        palette = self.get_palette()
 
         def row(mut: Mutation) -> tuple:
             color = palette[mut.index] # FIXME
@@ -311,18 +1386,21 @@ class Builder:
                 "e+": str(len(mut.edges_added)),
                 "e~": str(len(mut.edges_altered)),
                 "e-": str(len(mut.edges_removed)),
+                "f<": str(mut.faces_unified),
+                "e<": str(mut.edges_unified),
+                "time": f"{ mut.duration * 1000:.1f}ms",
             }
 
             return tuple(
-                (f"{ start }{ col }{ end }" if config.INFO_COLOR else col)
+                (f"{ start }{ col }{ end }" if self.config.INFO_COLOR else col)
                 for header, col in columns.items()
-                if header in config.COLUMNS_MUTATIONS
+                if header in self.config.COLUMNS_MUTATIONS
             )
 
         str_table = tabulate(
             [row(mutation) for mutation in self.mutations],
-            [header.title() for header in config.COLUMNS_MUTATIONS],
-            config.INFO_TABLE_FORMAT
+            [header.title() for header in self.config.COLUMNS_MUTATIONS],
+            self.config.INFO_TABLE_FORMAT
         )
         print(str_table, file=file or stdout)
 
@@ -330,8 +1408,63 @@ class Builder:
         """Set a face for debugging, so it will appear in the given color while
         the rest of the object will be translucent."""
 
+        self._unshare("faces_modes", "_modes_faces", "_journal", "_faces_dirty")
+
         for face in self._cast_faces(faces):
-            self.faces_modes[face.label] = cast_mode(mode)
+            self._set_face_mode(face.label, cast_mode(mode))
+
+        self._notify('debug', None)
+
+    def subscribe(self, callback: Callable[[BuilderEvent], None]):
+        """Call the given function with a BuilderEvent after each mutation,
+        undo and debug call, so the changes can be applied incrementally."""
+
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[BuilderEvent], None]):
+        """Stop calling the given subscribed function."""
+
+        self._subscribers.remove(callback)
+
+    def _notify(self, kind: str, mutation: Mutation | None):
+        """Send an event about the given mutation to the subscribers, with the
+        faces colors changes."""
+
+        if not self._subscribers:
+            return
+
+        changes = self._update_faces()
+        event = BuilderEvent(
+            kind,
+            mutation.index if mutation else len(self.mutations) - 1,
+            mutation,
+            {
+                face_hash: self._faces_colors[face_hash]
+                for face_hash, state in changes.items()
+                if state != ShapeState.REMOVED
+            },
+            [face_hash for face_hash, state in changes.items() if state == ShapeState.REMOVED],
+        )
+
+        for callback in list(self._subscribers):
+            callback(event)
+
+    def save(self, path: PathLike | str):
+        """Save the builder with all its mutations in a file at the given
+        path, that can be opened with Builder.load."""
+
+        save_builder(self, path)
+
+    @classmethod
+    def load(cls, path: PathLike | str, **options) -> Builder:
+        """Load a builder saved with Builder.save, using the given
+        configuration options. The file is memory-mapped and the shapes of
+        each mutation are read the first time they are accessed, so only the
+        last object is read when opening it."""
+
+        builder = cls(**options)
+        load_builder(builder, path)
+        return builder
 
     def export(
             self,
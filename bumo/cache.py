@@ -0,0 +1,143 @@
+"""A module used to cache mutations on disk."""
+from __future__ import annotations
+from hashlib import sha256
+from os import PathLike, utime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+import pickle
+
+import build123d as _
+
+from .shapes import shape_to_brep
+
+
+def hash_part(part: _.Part) -> str:
+    """Return a hash of the given part content, based on its BREP blob."""
+
+    return sha256(shape_to_brep(part)).hexdigest()
+
+
+def hash_location(location: _.Location) -> tuple[float, ...]:
+    """Return the values of the transformation matrix of the given location."""
+
+    transformation = location.wrapped.Transformation()
+    return tuple(
+        transformation.Value(row, col)
+        for row in range(1, 4)
+        for col in range(1, 5)
+    )
+
+
+class MutationCache:
+    """A content-addressed cache of mutations states, stored on disk in the
+    given directory, one file per mutation. When the files size exceeds the
+    given maximum size, the least recently used entries are removed."""
+
+    suffix = ".mutation"
+
+    def __init__(self, path: PathLike | str, max_size: int = 1 << 30):
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = self.get_size()
+
+        if self._size > self.max_size:
+            self.evict()
+
+    @classmethod
+    def get_key(cls, *params) -> str:
+        """Return the key of the entry identified by the given parameters,
+        which must have a reproducible representation."""
+
+        return sha256(repr(params).encode()).hexdigest()
+
+    def _get_file(self, key: str) -> Path:
+        return self.path / f"{ key }{ self.suffix }"
+
+    def get(self, key: str) -> dict | None:
+        """Return the mutation state stored with the given key, or None if it
+        is not cached."""
+
+        file = self._get_file(key)
+
+        try:
+            data = file.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        utime(file) # mark the entry as recently used
+        self.hits += 1
+        return pickle.loads(data)
+
+    def set(self, key: str, state: dict):
+        """Store the given mutation state with the given key, then evict the
+        least recently used entries if needed."""
+
+        data = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+        with NamedTemporaryFile(dir=self.path, suffix=".tmp", delete=False) as file:
+            file.write(data)
+
+        Path(file.name).replace(self._get_file(key))
+        self._size += len(data)
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache size is
+        below its maximum size."""
+
+        entries = sorted(self._list_entries())
+        self._size = sum(size for _mtime, size, _file in entries)
+
+        for _mtime, size, file in entries:
+            if self._size <= self.max_size:
+                break
+
+            file.unlink(missing_ok=True)
+            self._size -= size
+            self.evictions += 1
+
+    def _list_entries(self) -> list[tuple[float, int, Path]]:
+        """Return the last use time, the size and the file of each entry."""
+
+        entries = []
+
+        for file in self.path.glob(f"*{ self.suffix }"):
+            try:
+                stat = file.stat()
+            except FileNotFoundError: # removed by an other process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file))
+
+        return entries
+
+    def clear(self):
+        """Remove all the cache entries."""
+
+        for _mtime, _size, file in self._list_entries():
+            file.unlink(missing_ok=True)
+        self._size = 0
+
+    def get_size(self) -> int:
+        """Return the size of the cache entries, in bytes."""
+
+        return sum(size for _mtime, size, _file in self._list_entries())
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of cache lookups that found an entry."""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self):
+        return (
+            f"MutationCache({ self.path }, { self.hits } hits, { self.misses } misses, "
+            f"{ self.hit_rate :.0%} hit rate, { self._size } bytes)"
+        )
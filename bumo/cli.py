@@ -0,0 +1,117 @@
+"""The command line interface of Bumo."""
+from __future__ import annotations
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter, sleep
+import runpy
+import sys
+import traceback
+
+from .builder import Builder
+from .cache import MutationCache
+from . import config
+
+
+def run_script(path: Path, cache: MutationCache) -> dict[str, Builder]:
+    """Run the given script as the main module, with the given mutation cache,
+    and return the builders found in its global variables."""
+
+    sys.path.insert(0, str(path.parent))
+    try:
+        with config.scope(CACHE=cache):
+            script_globals = runpy.run_path(str(path), run_name="__main__")
+    finally:
+        sys.path.remove(str(path.parent))
+
+    return {
+        name: value for name, value in script_globals.items()
+        if isinstance(value, Builder)
+    }
+
+
+def print_builders(builders: dict[str, Builder]):
+    """Print the mutations of the given builders, including their duration."""
+
+    for name, builder in builders.items():
+        if "time" not in builder.config.COLUMNS_MUTATIONS:
+            builder.config.COLUMNS_MUTATIONS = [*builder.config.COLUMNS_MUTATIONS, "time"]
+
+        print(f"{ name }:")
+        builder.info()
+
+
+def run_once(path: Path, cache: MutationCache):
+    """Run the given script and print its builders, or the raised error."""
+
+    print(f"Running { path }...")
+    hits, misses = cache.hits, cache.misses
+    start = perf_counter()
+
+    try:
+        builders = run_script(path, cache)
+    except (Exception, SystemExit): # pylint: disable=broad-exception-caught
+        traceback.print_exc()
+        return
+
+    duration = perf_counter() - start
+    print_builders(builders)
+    print(
+        f"Done in { duration :.3f}s: { cache.hits - hits } mutations loaded "
+        f"from the cache, { cache.misses - misses } computed."
+    )
+
+
+def watch(path: Path, cache: MutationCache, interval: float):
+    """Run the given script each time it is modified, until interrupted. The
+    process is kept alive between runs, so the imported modules are loaded
+    only once, and the mutations cache is reused."""
+
+    last_mtime = None
+
+    while True:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError: # the file is being saved
+            mtime = None
+
+        if mtime is not None and mtime != last_mtime:
+            last_mtime = mtime
+            run_once(path, cache)
+            print(f"Watching { path } (Ctrl+C to quit).")
+
+        sleep(interval)
+
+
+def main(args: list[str] | None = None):
+    """Parse the command line arguments and run the command."""
+
+    parser = ArgumentParser(prog="bumo", description="Build123d mutables objects.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="run a script each time it is modified, in a warm process"
+    )
+    watch_parser.add_argument("script", type=Path, help="the Python script to run")
+    watch_parser.add_argument(
+        "--cache", type=Path, default=Path("~/.cache/bumo"),
+        help="the directory of the mutations cache (default: ~/.cache/bumo)"
+    )
+    watch_parser.add_argument(
+        "--cache-size", type=int, default=1 << 30,
+        help="the maximum size of the mutations cache, in bytes (default: 1 GiB)"
+    )
+    watch_parser.add_argument(
+        "--interval", type=float, default=0.5,
+        help="the delay between two checks of the script, in seconds (default: 0.5)"
+    )
+
+    options = parser.parse_args(args)
+    script = options.script.resolve()
+
+    if not script.is_file():
+        parser.error(f"{ options.script } is not a file.")
+
+    try:
+        watch(script, MutationCache(options.cache, options.cache_size), options.interval)
+    except KeyboardInterrupt:
+        pass
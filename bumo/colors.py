@@ -40,6 +40,18 @@ def get_rvb(color: _.Color) -> tuple[int, int, int]:
     return color.to_tuple()[:3]
 
 
+GOLDEN_RATIO = (5 ** 0.5 - 1) / 2
+
+
+class PaletteMode(Enum):
+    "The ways to pick the mutations colors from a color palette."
+    SPREAD = 0
+    "Spread the colors over the palette, according to the amount of mutations."
+    GOLDEN = 1
+    """Walk through the palette by golden ratio steps, so a mutation color only
+    depends on its index."""
+
+
 class ColorPalette(Enum):
     "The name of predefined color palettes."
     VIRIDIS = 0
@@ -47,20 +59,34 @@ class ColorPalette(Enum):
     MAGMA = 2
     PLASMA = 3
 
-    def build_palette(self, amount: int) -> list[_.Color]:
-        """Build a list of colors based on the given palette and the amount of
-        colors."""
+    def get_color(self, index: int) -> _.Color:
+        """Return the color at the given index (from 0 to 255) of the palette."""
 
         palette = [viridis, inferno, magma, plasma][self.value]
+        color_int = palette[index]
+        color_hex = hex(color_int)[2:].rjust(6, '0')
+        color_tuple = struct.unpack('BBB', bytes.fromhex(color_hex))
+        return _.Color(tuple(c/256 for c in color_tuple))
+
+    def get_golden_color(self, mut_idx: int) -> _.Color:
+        """Return the color of the mutation at the given index, using a golden
+        ratio walk through the palette, starting from its middle."""
+
+        return self.get_color(int((0.5 + mut_idx * GOLDEN_RATIO) % 1 * 255))
+
+    def build_palette(
+            self,
+            amount: int,
+            mode: PaletteMode = PaletteMode.SPREAD
+        ) -> list[_.Color]:
+        """Build a list of colors based on the given palette, the amount of
+        colors and the palette mode."""
 
-        def get_color(index: int) -> _.Color:
-            color_int = palette[index]
-            color_hex = hex(color_int)[2:].rjust(6, '0')
-            color_tuple = struct.unpack('BBB', bytes.fromhex(color_hex))
-            return _.Color(tuple(c/256 for c in color_tuple))
+        if mode == PaletteMode.GOLDEN:
+            return [self.get_golden_color(idx) for idx in range(amount)]
 
         if amount == 1:
-            return [get_color(127)]
+            return [self.get_color(127)]
 
         indexes = [int(idx / (amount - 1) * 255) for idx in range(amount)]
-        return [get_color(index) for index in indexes]
+        return [self.get_color(index) for index in indexes]
@@ -0,0 +1,140 @@
+"""A module used to compare the objects of two builders."""
+from __future__ import annotations
+from sys import stdout
+from typing import TextIO
+
+import build123d as _
+from tabulate import tabulate
+
+from .builder import Builder
+from .colors import get_rvb
+from .shapes import Hash, ShapeList, hash_shape
+
+
+class BuilderDiff:
+    """The differences between the current objects of two builders, based on
+    the hashes of their faces and edges: the faces of the new object that are
+    not in the old one, split into changed faces (sharing an edge with a
+    removed face) and added faces, and the faces of the old object that are
+    not in the new one."""
+
+    def __init__(self, old: Builder, new: Builder):
+        if not old.mutations or not new.mutations:
+            raise ValueError("Can not compare a builder without mutation.")
+
+        self.old = old
+        self.new = new
+        self.config = new.config
+
+        old_faces = set(old.last.faces.hashes())
+        new_faces = {face.label: face for face in new.last.faces}
+        old_edges = set(old.last.edges.hashes())
+        new_edges = set(new.last.edges.hashes())
+
+        self.faces_removed = ShapeList(
+            face for face in old.last.faces if face.label not in new_faces
+        )
+        self.edges_added = [h for h in new.last.edges.hashes() if h not in old_edges]
+        self.edges_removed = [h for h in old.last.edges.hashes() if h not in new_edges]
+        self.faces_origins = self._get_faces_origins(
+            [face for face in new.last.faces if face.label not in old_faces]
+        )
+
+        self.faces_changed = ShapeList(
+            new_faces[face_hash] for face_hash, origins in self.faces_origins.items()
+            if origins
+        )
+        self.faces_added = ShapeList(
+            new_faces[face_hash] for face_hash, origins in self.faces_origins.items()
+            if not origins
+        )
+        self.faces_untouched = ShapeList(
+            face for face in new.last.faces if face.label in old_faces
+        )
+
+    def _get_faces_origins(self, faces: list[_.Face]) -> dict[Hash, list[Hash]]:
+        """Return, for each of the given new faces, the hashes of the removed
+        faces sharing one of its edges. Only the edges of these faces are
+        explored, and their hashes are taken from the builders objects."""
+
+        edges_labels = {edge: edge.label for edge in self.old.last.edges}
+        edges_labels.update((edge, edge.label) for edge in self.new.last.edges)
+
+        def get_edges_hashes(face: _.Face) -> set[Hash]:
+            return {edges_labels.get(edge) or hash_shape(edge) for edge in face.edges()}
+
+        removed_edges = [(face.label, get_edges_hashes(face)) for face in self.faces_removed]
+        faces_origins = {}
+
+        for face in faces:
+            edges_hashes = get_edges_hashes(face)
+            faces_origins[face.label] = [
+                face_hash for face_hash, rm_edges_hashes in removed_edges
+                if edges_hashes & rm_edges_hashes
+            ]
+
+        return faces_origins
+
+    def get_faces(self) -> list[_.Face]:
+        """Return the faces of the new object colored according to their state
+        (see the DIFF_*_COLOR options, untouched faces being translucent), and
+        the removed faces of the old object."""
+
+        untouched_color = _.Color(*get_rvb(self.config.DEFAULT_COLOR), self.config.DEBUG_ALPHA)
+        faces = []
+
+        for shapes, color in (
+            (self.faces_untouched, untouched_color),
+            (self.faces_added, self.config.DIFF_ADDED_COLOR),
+            (self.faces_changed, self.config.DIFF_CHANGED_COLOR),
+            (self.faces_removed, self.config.DIFF_REMOVED_COLOR),
+        ):
+            for face in shapes:
+                face = _.Face(face.wrapped, face.label[:6])
+                face.color = color
+                faces.append(face)
+
+        return faces
+
+    def __call__(self) -> list[_.Face]:
+        return self.get_faces()
+
+    def info(self, file: TextIO | None=None):
+        """Print the faces added, changed and removed to the given file
+        (stdout by default)."""
+
+        def row(state: str, face: _.Face, color: _.Color) -> tuple:
+            r, g, b = [int(c * 255) for c in color.to_tuple()[:3]]
+            columns = (
+                state,
+                face.label[:6],
+                face.geom_type,
+                f"{ face.area :.2g}",
+                " ".join(h[:6] for h in self.faces_origins.get(face.label, [])),
+            )
+            if not self.config.INFO_COLOR:
+                return columns
+            return tuple(f"\033[38;2;{ r };{ g };{ b }m{ col }\033[0m" for col in columns)
+
+        str_table = tabulate(
+            [row("added", face, self.config.DIFF_ADDED_COLOR) for face in self.faces_added]
+            + [row("changed", face, self.config.DIFF_CHANGED_COLOR) for face in self.faces_changed]
+            + [row("removed", face, self.config.DIFF_REMOVED_COLOR) for face in self.faces_removed],
+            ["State", "Hash", "Type", "Area", "From"],
+            self.config.INFO_TABLE_FORMAT
+        )
+        print(str_table, file=file or stdout)
+
+    def __repr__(self):
+        return (
+            f"BuilderDiff(f+{ len(self.faces_added) } f~{ len(self.faces_changed) } "
+            f"f-{ len(self.faces_removed) }, e+{ len(self.edges_added) } "
+            f"e-{ len(self.edges_removed) })"
+        )
+
+
+def diff(old: Builder, new: Builder) -> BuilderDiff:
+    """Compare the current objects of the two given builders, ex. two
+    revisions of a part."""
+
+    return BuilderDiff(old, new)
@@ -1,12 +1,20 @@
 """Bumo configuration variables."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from build123d import Color
-from .colors import ColorPalette
+from .colors import ColorPalette, PaletteMode
 
 
 COLOR_PALETTE = ColorPalette.VIRIDIS
 "The color palette to use when auto_color is enabled."
 
+PALETTE_MODE = PaletteMode.SPREAD
+"""The way mutations colors are picked in the color palette. Use
+PaletteMode.GOLDEN to keep the colors of existing mutations when mutating."""
+
 DEBUG_ALPHA = 0.2
 "The alpha value used for translucent shapes in debug mode."
 
@@ -16,6 +24,21 @@ DEFAULT_COLOR = Color("orange")
 DEFAULT_DEBUG_COLOR = Color("red")
 "The default color to be used when using the debug mode."
 
+DIFF_ADDED_COLOR = Color("green")
+"The color of the faces added to the new object when comparing builders."
+
+DIFF_CHANGED_COLOR = Color("yellow")
+"The color of the faces changed in the new object when comparing builders."
+
+DIFF_REMOVED_COLOR = Color("red")
+"The color of the faces of the old object removed when comparing builders."
+
+DIFF_WORKERS = 1
+"""The amount of processes used to hash the shapes of the solids altered by a
+mutation, when it alters several solids. Set to None to use all CPUs, or to 1
+to hash them in the current process. The processes are started once, then
+reused by the next mutations."""
+
 INFO_COLOR = True
 "Set to False to disable terminal colors in the info table."
 
@@ -26,8 +49,100 @@ https://github.com/astanin/python-tabulate?tab=readme-ov-file#table-format
 
 COLUMNS_MUTATIONS = ["idx", "label", "type", "f+", "f~", "f-", "e+", "e~", "e-"]
 """"The columns to display in mutations info tables, among:
-idx, label, type, color_hex, color_name, f+, f~, f-, e+, e~, e-."""
+idx, label, type, color_hex, color_name, f+, f~, f-, e+, e~, e-, f<, e<,
+time."""
 
 COLUMNS_SHAPES = ["hash", "type", "area", "position", "orientation"]
 """"The columns to display in shapes info tables, among:
 hash, type, area, color_hex, color_name."""
+
+BOOLEAN_PARALLEL = True
+"Set to False to disable the multithreading of OCCT boolean operations."
+
+BOOLEAN_FUZZY = 0.0
+"""The fuzzy tolerance of boolean operations. Setting it to the precision of
+the shapes hashes (0.001) avoids spurious added faces."""
+
+BOOLEAN_OBB = False
+"Set to True to use oriented bounding boxes to speed up boolean operations."
+
+BOOLEAN_CLEAN = None
+"""Set to True to unify the same-domain faces and edges of the results of all
+boolean operations, to False to never unify them, or to None to unify them
+only for fuse and common operations."""
+
+FUSE_WORKERS = 1
+"""The amount of processes used to fuse the parts given to add_many and
+sub_many before applying them. Set to None to use all CPUs, or to 1 to fuse
+them in a single boolean operation in the current process. The resulting
+geometry is the same, but the edges order of the faces depends on the fusion
+order, so faces hashes (used by the cache, replay and diff) can differ from
+a fusion in a single operation."""
+
+FUSE_CHUNKSIZE = 2
+"The amount of parts fused together by a worker on each round of the parallel fusion."
+
+CACHE = None
+"""A MutationCache used to store the mutations on disk and load them instead
+of computing them again, or None to disable the cache."""
+
+
+OPTIONS = [name for name in dir() if name.isupper()]
+"The names of the configuration options."
+
+_scoped_options: ContextVar[Mapping[str, Any]] = ContextVar(
+    "scoped_options", default=MappingProxyType({})
+)
+
+
+def _check_options(options: dict[str, Any]):
+    """Raise an error if one of the given options doesn't exist."""
+
+    for name in options:
+        if name not in OPTIONS:
+            raise ValueError(f"Unknown configuration option: { name }.")
+
+
+class Config:
+    """A snapshot of the configuration options, taken when a builder is
+    created: the module variables, overridden by the options of the enclosing
+    scopes, then by the given options."""
+
+    def __init__(self, **options):
+        _check_options(options)
+        values = {name: globals()[name] for name in OPTIONS}
+        values.update(_scoped_options.get())
+        values.update(options)
+        self.__dict__.update(
+            (name, list(value) if isinstance(value, list) else value)
+            for name, value in values.items()
+        )
+
+    def __getstate__(self) -> dict:
+        return {
+            name: value.to_tuple() if isinstance(value, Color) else value
+            for name, value in self.__dict__.items()
+        }
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(
+            (name, Color(*value) if isinstance(globals()[name], Color) else value)
+            for name, value in state.items()
+        )
+
+    def __repr__(self):
+        return f"Config({ ', '.join(f'{ k }={ v !r}' for k, v in self.__dict__.items()) })"
+
+
+@contextmanager
+def scope(**options):
+    """Context manager overriding the given options for the builders created
+    inside it. Scopes are local to the current thread or asyncio task, and can
+    be nested."""
+
+    _check_options(options)
+    token = _scoped_options.set({**_scoped_options.get(), **options})
+    try:
+        yield
+    finally:
+        _scoped_options.reset(token)
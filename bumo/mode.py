@@ -2,7 +2,7 @@ from enum import Enum
 
 import build123d as _
 
-from . import config
+from .config import Config
 from .colors import ColorLike, cast_color
 
 
@@ -14,17 +14,39 @@ class ModeType(Enum):
 
 
 class Mode:
-    def __init__(self, mode_type: ModeType, color: _.Color) -> None:
-        self.mode_type = mode_type
-        self.color = color
+    """An immutable face mode. Debug modes without color use the default debug
+    color of the builder configuration."""
+
+    __slots__ = ("mode_type", "color")
+
+    def __init__(self, mode_type: ModeType, color: _.Color | None = None) -> None:
+        object.__setattr__(self, "mode_type", mode_type)
+        object.__setattr__(self, "color", color)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError("Modes are immutable.")
+
+    def __getstate__(self) -> dict:
+        color = None if self.color is None else self.color.to_tuple()
+        return {"mode_type": self.mode_type, "color": color}
+
+    def __setstate__(self, state: dict):
+        color = None if state["color"] is None else _.Color(*state["color"])
+        object.__setattr__(self, "mode_type", state["mode_type"])
+        object.__setattr__(self, "color", color)
+
+    def get_color(self, auto_color: _.Color, config: Config | None = None) -> _.Color:
+        config = Config() if config is None else config
 
-    def get_color(self, auto_color: _.Color):
         if self.mode_type == ModeType.AUTO:
             return auto_color
 
         if self.mode_type == ModeType.DEFAULT:
             return config.DEFAULT_COLOR
 
+        if self.color is None:
+            return config.DEFAULT_DEBUG_COLOR
+
         return self.color
 
 
@@ -34,5 +56,5 @@ def cast_mode(mode: Mode | ColorLike) -> Mode:
     return Mode(ModeType.FIXED, cast_color(mode))
 
 
-AUTO = Mode(ModeType.AUTO, config.DEFAULT_COLOR)
-DEBUG = Mode(ModeType.DEBUG, config.DEFAULT_DEBUG_COLOR)
+AUTO = Mode(ModeType.AUTO)
+DEBUG = Mode(ModeType.DEBUG)
@@ -1,9 +1,15 @@
 """Module containing the Mutation class."""
 from __future__ import annotations
+from sys import intern
+from typing import Any, Callable
 
 import build123d as _
 
-from .shapes import Hash, ShapeState, hash_shape, ShapeList, ShapeLike
+from .shapes import (
+    Hash, ShapeState, ShapeList, ShapeLike, hash_shape, add_shape_label,
+    shape_to_brep, brep_to_shape
+)
+from .parallel import hash_solids
 
 
 class Mutation:
@@ -15,31 +21,143 @@ class Mutation:
         previous: Mutation | None,
         name: str,
         index: int,
-        faces_alias: dict[Hash, Hash] | None
+        faces_alias: dict[Hash, Hash] | None,
+        faces_tools: dict[_.Face, int] | None = None,
+        shapes_labels: dict[ShapeLike, Hash] | None = None,
+        diff_workers: int | None = 1,
     ) -> None:
+        self.object = obj
         self.previous = previous
         self.name = name
         self.index = index
         self.faces_alias = faces_alias or {}
 
         self.id = f"{ name }-{ index }"
-
-        self.faces = ShapeList(obj.faces())
+        self.duration = 0.0 # set by the builder once the mutation is applied
+        self.inputs: tuple[str, dict[str, Any]] | None = None # set by the builder
+        self.cache_key: str | None = None # set by the builder when using a cache
+        self.faces_unified = 0 # faces removed by the unification of same-domain faces
+        self.edges_unified = 0
+
+        self._hashes: dict[type[ShapeLike], set[Hash]] = {}
+        self._places: list[tuple[_.GeomType, _.Location, _.Location]] | None = None
+        self._faces_origins: dict[Hash, list[Hash]] | None = None
+        labels = self.get_known_labels(shapes_labels)
+
+        self.solids = obj.solids()
+        self.solids_state = self.get_solids_state()
+        self.hash_altered_solids(labels, diff_workers)
+
+        # shapes are labelled before their states are computed, so the edges
+        # and vertices hashes are reused when looking for altered shapes
+        self.faces = ShapeList(obj.faces(), labels)
+        self.edges = ShapeList(obj.edges(), labels)
+        self.vertices = ShapeList(obj.vertices(), labels)
         self.faces_state = self.get_shapes_state(_.Face)
 
+        faces_tools = faces_tools or {}
+        self.faces_tools = {
+            face.label: faces_tools[face] for face in self.faces
+            if face in faces_tools
+        }
+
         self.faces_added = self.filter_shapes(ShapeState.ADDED, _.Face)
         self.faces_altered = self.filter_shapes(ShapeState.ALTERED, _.Face)
         self.faces_untouched = self.filter_shapes(ShapeState.UNTOUCHED, _.Face)
         self.faces_removed = self.filter_shapes(ShapeState.REMOVED, _.Face)
 
-        self.edges = ShapeList(obj.edges())
         self.edges_state = self.get_shapes_state(_.Edge)
         self.edges_added = self.filter_shapes(ShapeState.ADDED, _.Edge)
         self.edges_altered = self.filter_shapes(ShapeState.ALTERED, _.Edge)
         self.edges_untouched = self.filter_shapes(ShapeState.UNTOUCHED, _.Edge)
         self.edges_removed = self.filter_shapes(ShapeState.REMOVED, _.Edge)
 
-        self.vertices = ShapeList(obj.vertices())
+    def get_known_labels(
+            self,
+            shapes_labels: dict[ShapeLike, Hash] | None
+        ) -> dict[ShapeLike, Hash]:
+        """Return the already known hashes of shapes, so they don't have to be
+        computed again: the shapes of the previous mutation that were kept as
+        is by the operation, and the given shapes labels."""
+
+        labels: dict[ShapeLike, Hash] = {}
+
+        if self.previous:
+            for shape_type in (_.Face, _.Edge, _.Vertex):
+                labels.update(
+                    (shape, shape.label)
+                    for shape in self.previous.get_shapes(shape_type)
+                )
+
+        labels.update(shapes_labels or {})
+        return labels
+
+    def get_solids_state(self) -> list[ShapeState]:
+        """Return the state of each solid of the object: untouched if the solid
+        was kept as is by the operation, otherwise altered (or added for the
+        first mutation). Shapes of untouched solids are not diffed again."""
+
+        if not self.previous:
+            return [ShapeState.ADDED] * len(self.solids)
+
+        previous_solids = set(self.previous.solids)
+        return [
+            ShapeState.UNTOUCHED if solid in previous_solids
+            else ShapeState.ALTERED
+            for solid in self.solids
+        ]
+
+    def hash_altered_solids(self, labels: dict[ShapeLike, Hash], workers: int | None):
+        """Hash the unknown shapes of the altered solids in parallel, using the
+        given amount of processes (None for all CPUs), and add them to the
+        given labels."""
+
+        solids = [
+            solid for solid, state in zip(self.solids, self.solids_state)
+            if state != ShapeState.UNTOUCHED
+        ]
+
+        if workers == 1 or len(solids) < 2:
+            return
+
+        labels.update(hash_solids(solids, labels, workers))
+
+    def get_solid_shapes(
+            self,
+            solid_idx: int,
+            shape_type: type[ShapeLike]
+        ) -> ShapeList:
+        """Return the shapes of the given type belonging to the solid at the
+        given index."""
+
+        solid = self.solids[solid_idx]
+        solid_shapes = set(
+            solid.faces() if shape_type == _.Face
+            else solid.edges() if shape_type == _.Edge
+            else solid.vertices()
+        )
+        return ShapeList(
+            shape for shape in self.get_shapes(shape_type)
+            if shape in solid_shapes
+        )
+
+    def get_hashes(self, shape_type: type[ShapeLike]) -> set[Hash]:
+        """Return the set of hashes of the mutation shapes of the given type."""
+
+        if shape_type not in self._hashes:
+            self._hashes[shape_type] = set(self.get_shapes(shape_type).hashes())
+        return self._hashes[shape_type]
+
+    def get_faces_places(self) -> list[tuple[_.GeomType, _.Location, _.Location]]:
+        """Return the type, location and center location of each face of the
+        mutation, computed once."""
+
+        if self._places is None:
+            self._places = [
+                (face.geom_type, face.location, face.center_location)
+                for face in self.faces
+            ]
+        return self._places
 
     def get_shapes(self, shape_type: type[ShapeLike]) -> ShapeList:
         """Return the mutation shapes belonging the given shape type."""
@@ -51,9 +169,167 @@ class Mutation:
             return self.vertices
         raise TypeError
 
+    def get_tool_faces(self, tool_idx: int) -> ShapeList[_.Face]:
+        """Return the faces of the object coming from the tool at the given
+        index, for mutations applied with several tools."""
+
+        return ShapeList(
+            face for face in self.faces
+            if self.faces_tools.get(face.label) == tool_idx
+        )
+
     def __repr__(self):
         return self.id
 
+    @classmethod
+    def from_state(cls, state: dict, previous: Mutation | None, index: int) -> Mutation:
+        """Restore a mutation from the given state (see __getstate__), as the
+        mutation following the given one, at the given index."""
+
+        mutation = cls.__new__(cls)
+        mutation.__setstate__({**state, "index": index})
+        mutation.previous = previous
+        return mutation
+
+    def __getstate__(self) -> dict:
+        """Return the state of the mutation, used to pickle it: the object and
+        the removed shapes are serialized as BREP blobs, and the hashes and
+        states of the shapes are stored as lists, in their exploration order.
+        The previous mutation is not included."""
+
+        def to_brep(shapes: ShapeList) -> bytes | None:
+            return shape_to_brep(_.Compound(shapes)) if shapes else None
+
+        return {
+            "name": self.name,
+            "index": self.index,
+            "duration": self.duration,
+            "faces_alias": self.faces_alias,
+            "faces_tools": self.faces_tools,
+            "unified": [self.faces_unified, self.edges_unified],
+            "brep": shape_to_brep(self.object),
+            "solids_state": [state.value for state in self.solids_state],
+            "labels": [
+                self.faces.hashes(),
+                self.edges.hashes(),
+                self.vertices.hashes()
+            ],
+            "states": [
+                (list(shapes_state), [state.value for state in shapes_state.values()])
+                for shapes_state in (self.faces_state, self.edges_state)
+            ],
+            "removed": [
+                (to_brep(self.faces_removed), self.faces_removed.hashes()),
+                (to_brep(self.edges_removed), self.edges_removed.hashes()),
+            ],
+            "faces_origins": self._faces_origins,
+        }
+
+    def __setstate__(self, state: dict):
+        """Restore the mutation from the given state, without computing any
+        hash. The previous mutation is set by the builder."""
+
+        self._set_metadata(state)
+        self._set_shapes_state(state)
+
+    @classmethod
+    def lazy(
+            cls,
+            state: dict,
+            previous: Mutation | None,
+            load_shapes: Callable[[], dict]
+        ) -> Mutation:
+        """Return a mutation restored from the given state, except its object
+        and shapes, which are restored from the state returned by the given
+        function the first time one of them is accessed."""
+
+        mutation = cls.__new__(cls)
+        mutation._load_shapes = load_shapes
+        mutation._set_metadata(state)
+        mutation.previous = previous
+        return mutation
+
+    def __getattr__(self, name: str):
+        """Restore the object and the shapes of a lazy mutation when one of
+        them is accessed for the first time (see Mutation.lazy)."""
+
+        load_shapes = self.__dict__.pop("_load_shapes", None)
+
+        if load_shapes is None or name.startswith("__"):
+            raise AttributeError(f"'Mutation' object has no attribute '{ name }'")
+
+        self._set_shapes_state(load_shapes())
+        return getattr(self, name)
+
+    def _set_metadata(self, state: dict):
+        """Restore the attributes of the mutation that don't hold shapes from
+        the given state."""
+
+        self.previous = None
+        self.name = state["name"]
+        self.index = state["index"]
+        self.faces_alias = state["faces_alias"]
+        self.faces_tools = state["faces_tools"]
+        self.id = f"{ self.name }-{ self.index }"
+        self.duration = state["duration"]
+        self.inputs = None
+        self.cache_key = None
+        self.faces_unified, self.edges_unified = state.get("unified", (0, 0))
+
+    def _set_shapes_state(self, state: dict):
+        """Restore the object and the shapes of the mutation from the given
+        state. Hashes are interned, as the ones returned by hash_shape."""
+
+        def with_labels(shapes: list[ShapeLike], labels: list[Hash]) -> ShapeList:
+            return ShapeList(
+                add_shape_label(shape, intern(label)) for shape, label in zip(shapes, labels)
+            )
+
+        def filter_states(
+                shapes: ShapeList,
+                shapes_state: dict[Hash, ShapeState],
+                shape_state: ShapeState
+            ) -> ShapeList:
+            shapes_dict = {shape.label: shape for shape in shapes}
+            return ShapeList(
+                shapes_dict[shape_hash]
+                for shape_hash, state in shapes_state.items()
+                if state == shape_state
+            )
+
+        self.object = brep_to_shape(state["brep"])
+        self._hashes = {}
+        self._places = None
+        self._faces_origins = state["faces_origins"]
+
+        self.solids = self.object.solids()
+        self.solids_state = [ShapeState(value) for value in state["solids_state"]]
+
+        faces_labels, edges_labels, vertices_labels = state["labels"]
+        self.faces = with_labels(self.object.faces(), faces_labels)
+        self.edges = with_labels(self.object.edges(), edges_labels)
+        self.vertices = with_labels(self.object.vertices(), vertices_labels)
+
+        self.faces_state, self.edges_state = [
+            dict(zip(map(intern, hashes), (ShapeState(value) for value in values)))
+            for hashes, values in state["states"]
+        ]
+
+        (faces_brep, faces_hashes), (edges_brep, edges_hashes) = state["removed"]
+        self.faces_removed = with_labels(
+            brep_to_shape(faces_brep).faces() if faces_brep else [], faces_hashes
+        )
+        self.edges_removed = with_labels(
+            brep_to_shape(edges_brep).edges() if edges_brep else [], edges_hashes
+        )
+
+        self.faces_added = filter_states(self.faces, self.faces_state, ShapeState.ADDED)
+        self.faces_altered = filter_states(self.faces, self.faces_state, ShapeState.ALTERED)
+        self.faces_untouched = filter_states(self.faces, self.faces_state, ShapeState.UNTOUCHED)
+        self.edges_added = filter_states(self.edges, self.edges_state, ShapeState.ADDED)
+        self.edges_altered = filter_states(self.edges, self.edges_state, ShapeState.ALTERED)
+        self.edges_untouched = filter_states(self.edges, self.edges_state, ShapeState.UNTOUCHED)
+
     def filter_shapes(self, state: ShapeState, shape_type: type[ShapeLike]) -> ShapeList:
         """Return the shapes of the current object that match the given state."""
 
@@ -63,26 +339,32 @@ class Mutation:
             self.previous if self.previous and state == ShapeState.REMOVED
             else self
         )
-        shapes = mutation.get_shapes(shape_type)
+        shapes = {shape.label: shape for shape in mutation.get_shapes(shape_type)}
         shapes_state = self.faces_state if shape_type == _.Face else self.edges_state
 
-        faces = [shapes.get(h) for h, s in shapes_state.items() if s == state]
+        faces = [shapes[h] for h, s in shapes_state.items() if s == state]
         return ShapeList(faces)
 
     def get_shapes_state(self, shape_type: type[ShapeLike]) -> dict[Hash, ShapeState]:
         """Return a dictionnary holding the state of each face of the object."""
 
+        previous_hashes = self.previous.get_hashes(shape_type) if self.previous else set()
+        labels = {
+            shape: shape.label
+            for shape in (self.edges if shape_type == _.Face else self.vertices)
+        }
+
         def get_state(shape: ShapeLike) -> ShapeState:
             if not self.previous:
                 return ShapeState.ADDED
 
-            if self.previous.get_shapes(shape_type).contain(shape.label):
+            if shape.label in previous_hashes:
                 return ShapeState.UNTOUCHED
 
-            if isinstance(shape, _.Face) and self.is_altered_face(shape):
+            if isinstance(shape, _.Face) and self.is_altered_face(shape, labels):
                 return ShapeState.ALTERED
 
-            if isinstance(shape, _.Edge) and self.is_altered_edge(shape):
+            if isinstance(shape, _.Edge) and self.is_altered_edge(shape, labels):
                 return ShapeState.ALTERED
 
             return ShapeState.ADDED
@@ -91,9 +373,9 @@ class Mutation:
         shapes_state = {shape.label: get_state(shape) for shape in shapes}
 
         if self.previous:
-            for previous_shape in self.previous.get_shapes(shape_type):
-                if not shapes.contain(previous_shape.label):
-                    shapes_state[previous_shape.label] = ShapeState.REMOVED
+            for previous_hash in self.previous.get_shapes(shape_type).hashes():
+                if previous_hash not in shapes_state:
+                    shapes_state[previous_hash] = ShapeState.REMOVED
 
         return shapes_state
 
@@ -108,44 +390,87 @@ class Mutation:
                 if this_hash == hash_shape(that_edge):
                     return True
 
-        if (
+        return cls.is_same_place(this_face, that_face)
+
+    @classmethod
+    def is_same_place(cls, this_face: _.Face, that_face: _.Face):
+        """Check if the two given faces have the same type and location."""
+
+        return (
             this_face.geom_type == that_face.geom_type
             and this_face.location == that_face.location
             and this_face.center_location == that_face.center_location
-        ):
-            return True
+        )
 
-        return False
+    def get_faces_origins(self) -> dict[Hash, list[Hash]]:
+        """Return, for each altered face, the hashes of the removed faces it
+        was altered from (see is_altered_faces). Computed once, hashing the
+        edges of each face only once and reusing the known edges hashes."""
+
+        if self._faces_origins is not None:
+            return self._faces_origins
 
-    def is_altered_face(self, face: _.Face):
+        edges_labels = {edge: edge.label for edge in self.edges}
+        if self.previous:
+            edges_labels.update((edge, edge.label) for edge in self.previous.edges)
+
+        def get_edges_hashes(face: _.Face) -> set[Hash]:
+            return {edges_labels.get(edge) or hash_shape(edge) for edge in face.edges()}
+
+        faces_removed = [(face, get_edges_hashes(face)) for face in self.faces_removed]
+        self._faces_origins = {}
+
+        for face_al in self.faces_altered:
+            edges_hashes = get_edges_hashes(face_al)
+            self._faces_origins[face_al.label] = [
+                face_rm.label for face_rm, rm_edges_hashes in faces_removed
+                if edges_hashes & rm_edges_hashes or self.is_same_place(face_al, face_rm)
+            ]
+
+        return self._faces_origins
+
+    def is_altered_face(self, face: _.Face, labels: dict[ShapeLike, Hash] | None = None):
         """Check if the given face were altered, by comparing the edges of the
-        face: if a similar edge is found in the object, it is altered."""
+        face: if a similar edge is found in the object, it is altered. The
+        edges hashes are taken from the given labels when found."""
 
         if not self.previous:
             return True
 
+        labels = labels or {}
+
         for edge in face.edges():
-            if self.previous.edges.contain(hash_shape(edge)):
+            if (labels.get(edge) or hash_shape(edge)) in self.previous.get_hashes(_.Edge):
                 return True
 
-        for that_face in self.previous.faces:
-            if (face.geom_type == that_face.geom_type
-                and face.location == that_face.location
-                and face.center_location == that_face.center_location
-            ):
+        geom_type, location = face.geom_type, face.location
+        center_location = None
+
+        for that_geom_type, that_location, that_center_location in self.previous.get_faces_places():
+            # positions are compared first, as comparing orientations is slower
+            if geom_type != that_geom_type or location.position != that_location.position:
+                continue
+
+            if center_location is None:
+                center_location = face.center_location
+
+            if location == that_location and center_location == that_center_location:
                 return True
 
         return False
 
-    def is_altered_edge(self, edge: _.Edge):
+    def is_altered_edge(self, edge: _.Edge, labels: dict[ShapeLike, Hash] | None = None):
         """Check if the given edge were altered, by comparing the vertices of
-        the face: if a similar vertex is found in the object, it is altered."""
+        the face: if a similar vertex is found in the object, it is altered.
+        The vertices hashes are taken from the given labels when found."""
 
         if not self.previous:
             return True
 
+        labels = labels or {}
+
         for vertex in edge.vertices():
-            if self.previous.vertices.contain(hash_shape(vertex)):
+            if (labels.get(vertex) or hash_shape(vertex)) in self.previous.get_hashes(_.Vertex):
                 return True
 
         return False
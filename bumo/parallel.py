@@ -0,0 +1,111 @@
+"""A module used to run operations in a pool of processes."""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+
+import build123d as _
+
+from .booleans import BooleanType, boolean
+from .shapes import Hash, ShapeLike, shape_to_brep, brep_to_shape, hash_shape
+
+
+_executors: dict[int | None, ProcessPoolExecutor] = {}
+
+
+def get_executor(workers: int | None) -> ProcessPoolExecutor:
+    """Return the pool of processes with the given amount of workers (the
+    amount of CPUs if None), created the first time it is requested then
+    reused, so processes are not started again for each operation."""
+
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(workers)
+    return _executors[workers]
+
+
+def _fuse_breps(breps: list[bytes], options: dict) -> bytes:
+    """Fuse the parts serialized in the given BREP blobs with the given
+    boolean options, and return the serialized result. Used by the pool
+    workers."""
+
+    parts = [brep_to_shape(brep) for brep in breps]
+    return shape_to_brep(boolean(BooleanType.FUSE, _.Part(None), parts, **options)[0])
+
+
+def fuse_parts(
+        parts: list[_.Part],
+        workers: int | None = None,
+        chunksize: int = 2,
+        **options,
+    ) -> _.Part:
+    """Fuse the given parts in a pool of processes with the given amount of
+    workers (the amount of CPUs by default), using a tree reduction: on each
+    round, each chunk of parts of the given size is fused by a worker, until a
+    single part remains. Parts are sent to workers as BREP blobs, along with
+    the given boolean options. The result has the same geometry as a fusion
+    in a single operation, but not necessarily the same faces hashes, since
+    the edges order of the faces depends on the fusion order."""
+
+    if chunksize < 2:
+        raise ValueError("The chunk size must be at least 2.")
+
+    if not parts:
+        raise ValueError("No part to fuse.")
+
+    if len(parts) == 1:
+        return parts[0]
+
+    breps = [shape_to_brep(part) for part in parts]
+    executor = get_executor(workers)
+
+    while len(breps) > 1:
+        chunks = [
+            breps[idx:idx + chunksize]
+            for idx in range(0, len(breps), chunksize)
+        ]
+        breps = list(executor.map(_fuse_breps, chunks, [options] * len(chunks)))
+
+    return brep_to_shape(breps[0])
+
+
+def _get_solid_shapes(solid: _.Solid) -> list[ShapeLike]:
+    """Return the faces, edges and vertices of the given solid, always in the
+    same order for a given solid structure."""
+
+    return [*solid.faces(), *solid.edges(), *solid.vertices()]
+
+
+def _hash_brep(brep: bytes, indexes: list[int]) -> list[Hash]:
+    """Return the hashes of the shapes at the given indexes of the solid
+    serialized in the given BREP blob. Used by the pool workers."""
+
+    shapes = _get_solid_shapes(brep_to_shape(brep))
+    return [hash_shape(shapes[idx]) for idx in indexes]
+
+
+def hash_solids(
+        solids: list[_.Solid],
+        labels: dict[ShapeLike, Hash],
+        workers: int | None = None
+    ) -> dict[ShapeLike, Hash]:
+    """Hash the shapes of the given solids that are not found in the given
+    labels dict, in a pool of processes with the given amount of workers
+    (the amount of CPUs by default), one solid per task. Return a dict
+    containing the hash of each of these shapes."""
+
+    solids_shapes = [_get_solid_shapes(solid) for solid in solids]
+    solids_indexes = [
+        [idx for idx, shape in enumerate(shapes) if shape not in labels]
+        for shapes in solids_shapes
+    ]
+
+    solids_hashes = get_executor(workers).map(
+        _hash_brep,
+        [shape_to_brep(solid) for solid in solids],
+        solids_indexes
+    )
+
+    return {
+        shapes[idx]: shape_hash
+        for shapes, indexes, hashes
+        in zip(solids_shapes, solids_indexes, solids_hashes)
+        for idx, shape_hash in zip(indexes, hashes)
+    }
@@ -2,10 +2,14 @@
 from enum import Enum
 from typing import TypeAlias, Iterable, TextIO, TypeVar
 from hashlib import md5
-from sys import stdout
+from io import BytesIO
+from sys import intern, stdout
 
 from tabulate import tabulate
 import build123d as _
+from OCP.gp import gp_Pnt
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.TopoDS import TopoDS_Shape
 
 from . import config
 from .colors import color_to_str
@@ -23,7 +27,8 @@ class ShapeState(Enum):
     REMOVED = 4
 
 def hash_shape(shape: _.Shape) -> Hash:
-    """Return a reproducible hash.
+    """Return a reproducible hash. Hashes are interned, so the builders and
+    mutations of the process referencing identical shapes share their hashes.
     OCP 7.2 might produce better hashes that could make this unnecessary."""
 
     def to_int(number: float) -> int:
@@ -55,7 +60,31 @@ def hash_shape(shape: _.Shape) -> Hash:
     else:
         raise TypeError
 
-    return md5(str(serialized).encode()).hexdigest()
+    return intern(md5(str(serialized).encode()).hexdigest())
+
+
+def shape_to_brep(shape: _.Shape) -> bytes:
+    """Serialize the given shape to a binary BREP blob (without triangulation).
+    The version 3 of the format is used because some shapes written with the
+    version 4 (the current one in OCCT 7.7) can not be read back."""
+
+    stream = BytesIO()
+    BinTools.Write_s(
+        shape.wrapped,
+        stream,
+        False,
+        False,
+        BinTools_FormatVersion.BinTools_FormatVersion_VERSION_3
+    )
+    return stream.getvalue()
+
+
+def brep_to_shape(brep: bytes) -> _.Shape:
+    """Build a shape from the given binary BREP blob."""
+
+    shape = TopoDS_Shape()
+    BinTools.Read_s(shape, BytesIO(brep))
+    return _.Shape.cast(shape)
 
 
 ShapeLike: TypeAlias = _.Face | _.Edge | _.Vertex
@@ -70,11 +99,95 @@ def add_shape_hash(shape: ShapeT, force=False) -> ShapeT:
     return shape
 
 
+def add_shape_label(shape: ShapeT, label: Hash) -> ShapeT:
+    """Set the given label to the given shape."""
+    shape.label = label
+    return shape
+
+
+class ShapePattern:
+    """A shape meant to be placed at several locations. The faces of the shape
+    are explored only once, then the hashes of the faces of each placed copy
+    are derived from the location, without exploring the copy. These hashes
+    are only used for faces kept as is by the boolean operation: faces
+    modified by it are new shapes, hashed from their own geometry."""
+
+    def __init__(self, shape: _.Part):
+        self.shape = shape
+        self.faces = shape.faces()
+        self.faces_points = [self._get_face_points(face) for face in self.faces]
+
+    @classmethod
+    def _get_face_points(cls, face: _.Face) -> list[tuple]:
+        """Return the elements of the face used to hash it (see hash_shape),
+        keeping the vertices as points so they can be moved."""
+
+        def get_edge_points(edge: _.Edge) -> tuple:
+            points = [gp_Pnt(*vertex.to_tuple()) for vertex in edge.vertices()]
+            is_circle = edge.geom_type == _.GeomType.CIRCLE
+            radius = int(edge.radius * 1000) if is_circle else 0
+            return (edge.geom_type, points, radius)
+
+        return [get_edge_points(edge) for edge in face.edges()]
+
+    def hash_placed_faces(self, location: _.Location) -> list[Hash]:
+        """Return the hashes of the shape faces moved to the given location,
+        as they would be returned by hash_shape."""
+
+        transformation = location.wrapped.Transformation()
+
+        def serialize_point(point: gp_Pnt) -> tuple:
+            point = point.Transformed(transformation)
+            return tuple(int(c * 1000) for c in (point.X(), point.Y(), point.Z()))
+
+        return [
+            intern(md5(str(tuple(
+                (geom_type, tuple(serialize_point(p) for p in points), radius)
+                for geom_type, points, radius in face_points
+            )).encode()).hexdigest())
+            for face_points in self.faces_points
+        ]
+
+    def place(
+            self,
+            locations: Iterable[_.Location]
+        ) -> tuple[list[_.Shape], dict[ShapeLike, Hash]]:
+        """Return a copy of the shape (sharing its geometry) at each given
+        location, and a dict containing the hash of each face of the copies."""
+
+        shapes: list[_.Shape] = []
+        faces_labels: dict[ShapeLike, Hash] = {}
+
+        for location in locations:
+            shapes.append(_.Shape.cast(self.shape.wrapped.Moved(location.wrapped)))
+            faces_hashes = self.hash_placed_faces(location)
+
+            for face, face_hash in zip(self.faces, faces_hashes):
+                face_moved = _.Face(face.wrapped.Moved(location.wrapped))
+                faces_labels[face_moved] = face_hash
+
+        return shapes, faces_labels
+
+
 class ShapeList(_.ShapeList[ShapeT]):
     """A custom ShapeList that automatically adds a hash to the shape label,
     and with some extra utility methods."""
 
-    def __init__(self, shapes: Iterable[ShapeT]):
+    def __init__(
+            self,
+            shapes: Iterable[ShapeT],
+            labels: dict[ShapeLike, Hash] | None=None
+        ):
+        """Build the shape list. The hash of shapes found in the given labels
+        dict (by topological identity) are taken from it instead of being
+        computed."""
+
+        if labels:
+            shapes = (
+                shape if shape.label or shape not in labels
+                else add_shape_label(shape, labels[shape])
+                for shape in shapes
+            )
         super().__init__(add_shape_hash(shape) for shape in shapes)
 
     def __setitem__(self, index: int, shape: ShapeT):
@@ -114,11 +227,13 @@ class ShapeList(_.ShapeList[ShapeT]):
         """Prints an info table of all the faces to the given file or stream
         (default to stdout)"""
 
+        settings = config.Config()
+
         def str_vector(vector: _.Vector) -> str:
             return f"[{', '.join([f'{ n :.1g}' for n in vector.to_tuple()])}]"
 
         def row(shape: _.Shape) -> tuple:
-            color = shape.color or config.DEFAULT_COLOR
+            color = shape.color or settings.DEFAULT_COLOR
             r, g, b = [int(c * 255) for c in color.to_tuple()[:3]]
 
             start = f"\033[38;2;{ r };{ g };{ b }m"
@@ -135,14 +250,14 @@ class ShapeList(_.ShapeList[ShapeT]):
             }
 
             return tuple(
-                (f"{ start }{ color }{ end }" if config.INFO_COLOR else color)
+                (f"{ start }{ color }{ end }" if settings.INFO_COLOR else color)
                 for header, color in columns.items()
-                if header in config.COLUMNS_SHAPES
+                if header in settings.COLUMNS_SHAPES
             )
 
         str_table = tabulate(
             [row(shape) for shape in self],
-            [header.title() for header in config.COLUMNS_SHAPES],
-            config.INFO_TABLE_FORMAT
+            [header.title() for header in settings.COLUMNS_SHAPES],
+            settings.INFO_TABLE_FORMAT
         )
         print(str_table, file=file or stdout)
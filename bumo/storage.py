@@ -0,0 +1,369 @@
+"""A module used to save builders in files and to load them lazily.
+
+A file contains a header (the magic bytes, the format version and the index
+size), a JSON index holding the builder state and the mutations metadata,
+then the mutations blobs: BREP blobs of the objects and the removed shapes,
+and arrays of indexes of the shapes hashes and states."""
+from __future__ import annotations
+from array import array
+from mmap import mmap, ACCESS_READ
+from os import PathLike
+from pathlib import Path
+from sys import byteorder, intern
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING
+import json
+import struct
+
+import build123d as _
+
+from .mutation import Mutation
+from .mode import Mode, ModeType
+from .shapes import Hash
+
+if TYPE_CHECKING:
+    from .builder import Builder
+
+
+MAGIC = b"BUMO"
+VERSION = 1
+HEADER = struct.Struct("<4sHQ") # magic, version, index size
+
+
+class LazyFacesDict(dict):
+    """A faces dict whose faces are added the first time they are accessed:
+    they are taken from the given faces of the current object if found, so
+    they share its topology, otherwise from the shapes of the mutation that
+    added them, which are loaded if needed. Iterating over the dict loads all
+    the pending faces."""
+
+    def __init__(
+            self,
+            mutations: list[Mutation],
+            pending: dict[Hash, int],
+            faces: dict[Hash, _.Face],
+        ):
+        super().__init__()
+        self.mutations = mutations
+        self.pending = pending
+        self.faces = faces
+
+    def _load(self, mut_idx: int):
+        """Add the pending faces added by the mutation at the given index."""
+
+        mutation = self.mutations[mut_idx]
+
+        for face in mutation.faces_added + mutation.faces_altered:
+            if self.pending.get(face.label) == mut_idx:
+                del self.pending[face.label]
+                super().__setitem__(face.label, face)
+
+    def _load_all(self):
+        for face_hash in [h for h in self.pending if h in self.faces]:
+            del self.pending[face_hash]
+            super().__setitem__(face_hash, self.faces[face_hash])
+
+        for mut_idx in sorted(set(self.pending.values())):
+            self._load(mut_idx)
+
+    def __missing__(self, face_hash: Hash) -> _.Face:
+        if face_hash not in self.pending:
+            raise KeyError(face_hash)
+
+        if face_hash in self.faces:
+            del self.pending[face_hash]
+            super().__setitem__(face_hash, self.faces[face_hash])
+        else:
+            self._load(self.pending[face_hash])
+
+        return super().__getitem__(face_hash)
+
+    def __contains__(self, face_hash) -> bool:
+        return super().__contains__(face_hash) or face_hash in self.pending
+
+    def __delitem__(self, face_hash: Hash):
+        if self.pending.pop(face_hash, None) is None:
+            super().__delitem__(face_hash)
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self.pending)
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def get(self, face_hash: Hash, default=None):
+        return self[face_hash] if face_hash in self else default
+
+    def setdefault(self, face_hash: Hash, face: _.Face) -> _.Face:
+        if face_hash not in self:
+            self[face_hash] = face
+        return self[face_hash]
+
+    def keys(self):
+        self._load_all()
+        return super().keys()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def copy(self) -> LazyFacesDict:
+        """Return a copy of the dict, where pending faces are still pending."""
+
+        faces_dict = LazyFacesDict(self.mutations, dict(self.pending), self.faces)
+        dict.update(faces_dict, dict.items(self))
+        return faces_dict
+
+
+def _to_bytes(indexes: list[int]) -> bytes:
+    """Serialize the given indexes as little-endian unsigned integers."""
+
+    values = array("I", indexes)
+    if byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(data: bytes) -> list[int]:
+    """Read the indexes serialized with _to_bytes."""
+
+    values = array("I")
+    values.frombytes(data)
+    if byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+
+class _Writer:
+    """A helper used to build the index and the blobs of a file."""
+
+    def __init__(self):
+        self.hashes: dict[Hash, int] = {}
+        self.modes: dict[tuple, int] = {}
+        self.blobs: list[bytes] = []
+        self.size = 0
+
+    def hash_id(self, shape_hash: Hash) -> int:
+        return self.hashes.setdefault(shape_hash, len(self.hashes))
+
+    def hashes_ids(self, hashes: list[Hash]) -> list[int]:
+        return [self.hash_id(shape_hash) for shape_hash in hashes]
+
+    def mode_id(self, mode: Mode | None) -> int | None:
+        if mode is None:
+            return None
+
+        color = None if mode.color is None else mode.color.to_tuple()
+        return self.modes.setdefault((mode.mode_type.name, color), len(self.modes))
+
+    def blob(self, data: bytes | None) -> list[int] | None:
+        """Add the given blob and return its offset and size."""
+
+        if data is None:
+            return None
+
+        self.blobs.append(data)
+        self.size += len(data)
+        return [self.size - len(data), len(data)]
+
+    def mutation(self, mutation: Mutation) -> dict:
+        """Return the index entry of the given mutation, and add its blobs."""
+
+        state = mutation.__getstate__()
+        faces_origins = state["faces_origins"]
+        (faces_brep, faces_removed), (edges_brep, edges_removed) = state["removed"]
+        hashes = [*state["labels"], faces_removed, edges_removed]
+        hashes += [shapes_hashes for shapes_hashes, _values in state["states"]]
+
+        return {
+            "name": state["name"],
+            "duration": state["duration"],
+            "faces_alias": [
+                [self.hash_id(face_hash), self.hash_id(alias)]
+                for face_hash, alias in state["faces_alias"].items()
+            ],
+            "faces_tools": [
+                [self.hash_id(face_hash), tool_idx]
+                for face_hash, tool_idx in state["faces_tools"].items()
+            ],
+            "unified": state["unified"],
+            "faces_origins": None if faces_origins is None else [
+                [self.hash_id(face_hash), self.hashes_ids(origins)]
+                for face_hash, origins in faces_origins.items()
+            ],
+            "solids_state": state["solids_state"],
+            "lengths": [len(shapes_hashes) for shapes_hashes in hashes],
+            "object": self.blob(state["brep"]),
+            "faces_removed": self.blob(faces_brep),
+            "edges_removed": self.blob(edges_brep),
+            "hashes": self.blob(_to_bytes([
+                hash_id for shapes_hashes in hashes
+                for hash_id in self.hashes_ids(shapes_hashes)
+            ])),
+            "states": self.blob(bytes(
+                value for _hashes, values in state["states"] for value in values
+            )),
+        }
+
+
+def save_builder(builder: Builder, path: PathLike | str):
+    """Save the given builder in a file at the given path, replacing it
+    atomically if it exists."""
+
+    writer = _Writer()
+    mutations = [writer.mutation(mutation) for mutation in builder.mutations]
+
+    index = {
+        "mutations": mutations,
+        "faces_modes": [
+            [writer.hash_id(face_hash), writer.mode_id(mode)]
+            for face_hash, mode in builder.faces_modes.items()
+        ],
+        "faces_mutations": [
+            [writer.hash_id(face_hash), mut_idx]
+            for face_hash, mut_idx in builder.get_faces_mutations().items()
+        ],
+        "mutations_faces": [
+            [mut_idx, writer.hashes_ids(sorted(faces_hashes))]
+            for mut_idx, faces_hashes in builder._mutations_faces.items()
+        ],
+        "journal": [
+            [
+                [kind, writer.hash_id(face_hash), (
+                    writer.mode_id(old_value) if kind == "mode" else old_value
+                )]
+                for kind, face_hash, old_value in entries
+            ]
+            for entries in builder._journal
+        ],
+    }
+    index["hashes"] = list(writer.hashes)
+    index["modes"] = [list(mode) for mode in writer.modes]
+    index_data = json.dumps(index, separators=(",", ":")).encode()
+
+    # the file is written next to the target then moved over it, so builders
+    # loaded from the previous file keep reading its memory-mapped content
+    path = Path(path)
+    with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(index_data)))
+        file.write(index_data)
+        for blob in writer.blobs:
+            file.write(blob)
+
+    Path(file.name).replace(path)
+
+
+def load_builder(builder: Builder, path: PathLike | str):
+    """Load the builder saved in the file at the given path into the given
+    empty builder. The file is memory-mapped, and the shapes of each mutation
+    are read the first time they are accessed."""
+
+    with open(path, "rb") as file:
+        data = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+    magic, version, index_size = HEADER.unpack_from(data)
+
+    if magic != MAGIC:
+        raise ValueError(f"{ path } is not a Bumo file.")
+
+    if version != VERSION:
+        raise ValueError(f"Unsupported Bumo file version: { version }.")
+
+    index = json.loads(data[HEADER.size:HEADER.size + index_size])
+    blobs_start = HEADER.size + index_size
+    hashes: list[Hash] = [intern(shape_hash) for shape_hash in index["hashes"]]
+    modes = [
+        Mode(ModeType[mode_type], None if color is None else _.Color(*color))
+        for mode_type, color in index["modes"]
+    ]
+
+    def read_blob(blob: list[int] | None) -> bytes | None:
+        if blob is None:
+            return None
+        offset, size = blob
+        return data[blobs_start + offset:blobs_start + offset + size]
+
+    def load_shapes(entry: dict) -> dict:
+        """Return the shapes state of the mutation with the given entry."""
+
+        hashes_ids = iter(_from_bytes(read_blob(entry["hashes"]) or b""))
+        faces, edges, vertices, faces_rm, edges_rm, faces_st, edges_st = [
+            [hashes[next(hashes_ids)] for _idx in range(length)]
+            for length in entry["lengths"]
+        ]
+        states = list(read_blob(entry["states"]) or b"")
+        faces_origins = entry["faces_origins"]
+
+        return {
+            "brep": read_blob(entry["object"]),
+            "solids_state": entry["solids_state"],
+            "labels": [faces, edges, vertices],
+            "states": [
+                (faces_st, states[:len(faces_st)]),
+                (edges_st, states[len(faces_st):]),
+            ],
+            "removed": [
+                (read_blob(entry["faces_removed"]), faces_rm),
+                (read_blob(entry["edges_removed"]), edges_rm),
+            ],
+            "faces_origins": None if faces_origins is None else {
+                hashes[face_id]: [hashes[origin_id] for origin_id in origins]
+                for face_id, origins in faces_origins
+            },
+        }
+
+    previous = None
+
+    for mut_idx, entry in enumerate(index["mutations"]):
+        metadata = {
+            "name": entry["name"],
+            "index": mut_idx,
+            "duration": entry["duration"],
+            "faces_alias": {hashes[h]: hashes[alias] for h, alias in entry["faces_alias"]},
+            "faces_tools": {hashes[h]: tool_idx for h, tool_idx in entry["faces_tools"]},
+            "unified": entry.get("unified", [0, 0]),
+        }
+        mutation = Mutation.lazy(metadata, previous, lambda entry=entry: load_shapes(entry))
+        builder.mutations.append(mutation)
+        builder._mutations_ids[mutation.id] = mutation
+        builder._mutations_names.setdefault(mutation.name, []).append(mutation)
+        previous = mutation
+
+    for face_id, mode_id in index["faces_modes"]:
+        builder.faces_modes[hashes[face_id]] = modes[mode_id]
+        builder._modes_faces[modes[mode_id].mode_type].add(hashes[face_id])
+
+    builder._faces_mutations = {
+        hashes[face_id]: mut_idx for face_id, mut_idx in index["faces_mutations"]
+    }
+    builder._mutations_faces = {
+        mut_idx: {hashes[face_id] for face_id in faces_ids}
+        for mut_idx, faces_ids in index["mutations_faces"]
+    }
+    builder._journal = [
+        [
+            (kind, hashes[face_id], (
+                modes[old_value] if kind == "mode" and old_value is not None
+                else old_value
+            ))
+            for kind, face_id, old_value in entries
+        ]
+        for entries in index["journal"]
+    ]
+
+    pending = {
+        face_hash: mut_idx
+        for mut_idx, entries in enumerate(builder._journal)
+        for kind, face_hash, _old_value in entries
+        if kind == "face"
+    }
+    last_faces = {face.label: face for face in builder.last.faces} if builder.mutations else {}
+    builder.faces_dict = LazyFacesDict(builder.mutations, pending, last_faces)
+
+    if builder.mutations:
+        builder.object = builder.last.object
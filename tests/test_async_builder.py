@@ -0,0 +1,24 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import build123d as _
+import pytest
+
+from bumo import AsyncBuilder
+
+
+def test_async_builder():
+    async def build():
+        a = AsyncBuilder(executor=ThreadPoolExecutor(1))
+        await a.add(_.Box(4, 4, 4))
+        await a.sub(_.Cylinder(1, 8))
+        return a
+
+    a = asyncio.run(build())
+    assert [mutation.id for mutation in a.builder.mutations] == ["add-0", "sub-1"]
+
+
+def test_async_builder_process_executor():
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(TypeError):
+            AsyncBuilder(executor=executor)
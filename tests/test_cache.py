@@ -0,0 +1,40 @@
+import build123d as _
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+
+from bumo import Builder, MutationCache
+
+
+def build(cache: MutationCache, radius: float) -> Builder:
+    b = Builder(CACHE=cache)
+    b.add(_.Box(10, 10, 10))
+    b.fillet(b.object.edges().filter_by(_.Axis.Z), radius)
+    b.sub(_.Cylinder(1, 20))
+    return b
+
+
+def get_fillet_radius(b: Builder) -> float:
+    return max(
+        BRepAdaptor_Surface(face.wrapped).Cylinder().Radius()
+        for face in b.object.faces().filter_by(_.GeomType.CYLINDER)
+    )
+
+
+def test_cache_hit(tmp_path):
+    cache = MutationCache(tmp_path)
+    build(cache, 1)
+    b = build(cache, 1)
+
+    assert cache.hits == 3
+    assert get_fillet_radius(b) == 1
+
+
+def test_cache_close_parameters(tmp_path):
+    """Objects whose shapes hashes are equal once rounded must not share
+    cache entries."""
+
+    cache = MutationCache(tmp_path)
+    build(cache, 1.0003)
+    b = build(cache, 1.0004)
+
+    assert cache.hits == 1
+    assert abs(get_fillet_radius(b) - 1.0004) < 1e-7
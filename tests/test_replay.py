@@ -0,0 +1,64 @@
+import build123d as _
+import pytest
+
+from bumo import Builder
+
+
+def build() -> Builder:
+    b = Builder()
+    b.add(_.Box(10, 10, 2))
+    b.add(_.Box(4, 4, 4))
+    b.fillet(b.last.edges_added.filter_by(_.Axis.Z), 0.5)
+    b.sub(_.Cylinder(1, 10))
+    b.chamfer(b.last.edges_added[0], 0.2)
+    return b
+
+
+def get_colors(b: Builder) -> dict:
+    return {face_hash: color.to_tuple() for face_hash, color in b.get_faces_colors().items()}
+
+
+def test_replay():
+    b = build()
+    b.replay({"fillet-2": {"radius": 0.8}})
+
+    expected = build()
+    for _idx in range(3):
+        expected.undo()
+    expected.fillet(expected.last.edges_added.filter_by(_.Axis.Z), 0.8)
+    expected.sub(_.Cylinder(1, 10))
+    expected.chamfer(expected.last.edges_added[0], 0.2)
+
+    assert [m.id for m in b.mutations] == [m.id for m in expected.mutations]
+    assert get_colors(b) == get_colors(expected)
+
+
+def test_replay_failure():
+    """A replay that fails leaves the builder as it was before."""
+
+    b = build()
+    shown = {}
+
+    def on_event(event):
+        shown.update({h: color.to_tuple() for h, color in event.colors.items()})
+        for face_hash in event.hidden:
+            del shown[face_hash]
+
+    b.subscribe(on_event)
+    b.get_faces_colors()
+    shown.update(get_colors(b))
+    ids = [mutation.id for mutation in b.mutations]
+    colors = get_colors(b)
+    obj = b.object
+
+    # the fillet edges don't exist anymore with a higher second box
+    with pytest.raises(ValueError):
+        b.replay({1: {"part": _.Box(6, 6, 4)}})
+
+    assert [mutation.id for mutation in b.mutations] == ids
+    assert b.object is obj
+    assert get_colors(b) == colors
+    assert shown == colors
+
+    b.undo()
+    assert b.last.id == "sub-3"